@@ -1,31 +1,42 @@
 from datetime import datetime, timedelta
-from fastapi import FastAPI, HTTPException, Query, Depends
+from fastapi import FastAPI, HTTPException, Query, Depends, Header, Request
+from fastapi.responses import Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.security import get_api_key
 from app.core.constants import INDUSTRY_CATEGORIES, NEWS_KEYWORDS
+from app.core.keyword_matcher import keyword_matcher
+from app.core.cache import article_cache, search_cache, suggest_cache
+from app.core.serialization import FastJSONResponse, dumps_json
 from app.core.utils import suggest_keywords
-from app.db.elasticsearch import get_elasticsearch
-from app.models.news import NewsArticle, NewsArticleCreate, NewsArticleUpdate
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.query_guard import query_guard
+from app.db.elasticsearch import UNAVAILABLE_ERRORS, client_stats, es_breaker, get_elasticsearch, read_index
+from app.db.news_repository import ConflictError, FACET_FIELDS, search_flight
+from app.db.write_buffer import WriteBufferFullError
+from app.models.news import NewsArticle, NewsArticleBulkCreate, NewsArticleCreate, NewsBatchGetRequest, NewsArticleUpdate, NewsSearchBatchRequest
 from app.models.user import UserSubscription, UserSubscriptionCreate, UserSubscriptionUpdate
 from app.services.news_service import NewsService
 from app.services.scraper_service import ScraperService
 from app.core.background import create_background_task
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from app.services.event_service import EventService
+import hashlib
+import re
 import uuid
 import logging
 from datetime import datetime
 from app.models.user import UserSubscription, UserSubscriptionCreate, UserSubscriptionUpdate
 from app.services.user_subscription_service import UserSubscriptionService
-from app.models.responses.news import NewsArticleResponse
+from app.models.responses.news import NewsArticleResponse, NewsArticleCompactResponse
 
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title=settings.APP_NAME,
     description="A RESTful API for news articles using Elasticsearch",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware
@@ -39,6 +50,18 @@ app.add_middleware(
     max_age=86400,  # Cache preflight requests for 24 hours
 )
 
+async def _backend_unavailable(request: Request, exc: Exception):
+    """Answer 503 when Elasticsearch is unreachable, its circuit breaker is open or queued writes are backing up."""
+    retry_after = getattr(exc, "retry_after", None) or es_breaker.retry_after() or settings.ELASTICSEARCH_BREAKER_RESET_SECONDS
+    return FastJSONResponse(
+        status_code=503,
+        content={"detail": "Search backend is unavailable, please retry later"},
+        headers={"Retry-After": str(max(1, int(retry_after)))}
+    )
+
+for error in (CircuitOpenError, WriteBufferFullError, *UNAVAILABLE_ERRORS):
+    app.add_exception_handler(error, _backend_unavailable)
+
 
 @app.get("/health")
 async def health_check():
@@ -67,6 +90,87 @@ async def suggest_article_keywords(
     suggestions = suggest_keywords(text, max_suggestions)
     return {"suggestions": suggestions}
 
+def _resolve_search_keywords(q: str, keyword: Optional[str], industry: Optional[str]) -> Tuple[List[str], List[str], Optional[str]]:
+    """
+    Resolve the query text and the keyword/industry parameters of a search.
+
+    Returns:
+        Tuple of (keywords, filter_keywords, industry): every keyword related to
+        the search (used to pick images), the tags to filter on, and the valid
+        industry category to filter on, if any
+    """
+    # Extract keywords and industries mentioned in the query in a single pass
+    query_matches = keyword_matcher.match(q)
+    matching_keywords = query_matches.keywords + query_matches.industries
+    filter_keywords = []
+
+    # Check if keyword parameter is provided and valid
+    if keyword:
+        canonical_keyword = keyword_matcher.canonical_keyword(keyword)
+        if canonical_keyword:
+            matching_keywords.append(canonical_keyword)
+            filter_keywords.append(canonical_keyword)
+        else:
+            # Log invalid keyword but continue with search
+            logger.warning(f"Invalid keyword provided: {keyword}")
+    
+    # Check if industry parameter is provided and valid
+    valid_industry = None
+    if industry:
+        if industry in INDUSTRY_CATEGORIES:
+            valid_industry = industry
+            matching_keywords.extend(INDUSTRY_CATEGORIES[industry])
+        else:
+            # Log invalid industry but continue with search
+            logger.warning(f"Invalid industry provided: {industry}")
+
+    return list(set(matching_keywords)), filter_keywords, valid_industry
+
+def _article_etag(document: Dict) -> str:
+    """
+    Strong ETag for a stored article: its primary term and sequence number,
+    or a hash of updated_at when those aren't available.
+    """
+    if document.get("_seq_no") is not None and document.get("_primary_term") is not None:
+        return f'"{document["_primary_term"]}-{document["_seq_no"]}"'
+    digest = hashlib.blake2b(f'{document["id"]}:{document.get("updated_at")}'.encode("utf-8"), digest_size=8)
+    return f'"{digest.hexdigest()}"'
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+def _version_from_etag(etag: str) -> Optional[Tuple[int, int]]:
+    """Parse a version ETag from _article_etag into (seq_no, primary_term)."""
+    match = re.fullmatch(r'"(\d+)-(\d+)"', etag.strip())
+    if not match:
+        return None
+    return int(match.group(2)), int(match.group(1))
+
+def _parse_facets(facets) -> List[str]:
+    """
+    Parse a comma-separated facet list (or a list of names) and validate it against FACET_FIELDS.
+    """
+    if not facets:
+        return []
+    if isinstance(facets, str):
+        facets = facets.split(",")
+    names = []
+    for name in facets:
+        name = name.strip().lower()
+        if not name or name in names:
+            continue
+        if name not in FACET_FIELDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid facet '{name}'. Available facets: {list(FACET_FIELDS.keys())}"
+            )
+        names.append(name)
+    return names
+
 @app.get("/api/news/search", tags=["news"])
 async def search_news(
     q: str = Query(description="Search query"),
@@ -75,15 +179,19 @@ async def search_news(
     india_focus: bool = Query(True, description="Ensure content is focused on India"),
     business_only: bool = Query(True, description="Only return business-related content"),
     page: int = Query(1, ge=1, description="Page number"),
-    limit: int = Query(10, ge=1, le=100, description="Number of results per page"),
+    limit: int = Query(10, ge=0, le=100, description="Number of results per page (0 returns only total and facets)"),
     sort_by: str = Query("published_date", description="Field to sort by"),
     sort_order: str = Query("desc", description="Sort order (asc or desc)"),
+    facets: Optional[str] = Query(None, description="Comma-separated facet counts to include: categories, tags, sources"),
+    cursor: Optional[str] = Query(None, description="Cursor for deep pagination. Pass '*' to start, then the returned next_cursor"),
+    view: str = Query("full", pattern="^(full|compact)$", description="Response shape: full articles or compact items with a snippet"),
     api_key: str = Depends(get_api_key)
 ):
     """
     Search for news articles matching the provided query.
     By default, focuses on Indian business news.
     Optionally filter by keyword or industry category.
+    Use `page` for shallow pages and `cursor` to scroll deep into results.
     """
     # # Ensure India focus if requested
     # if india_focus:
@@ -96,75 +204,207 @@ async def search_news(
     #     # Add "business" to the query if not already present
     #     if "business" not in q.lower() and "industry" not in q.lower():
     #         q = f"{q} business"
-    
-    # Extract keywords and industries from the query if present
-    query_terms = q.lower().split()
-    
-    # Check if any query terms match known keywords or industries using fuzzy matching
-    matching_keywords = []
-    
-    for term in query_terms:
-        # Fuzzy match for keywords
-        for keyword in NEWS_KEYWORDS:
-            # Simple fuzzy match: if term is contained in keyword or vice versa
-            if term in keyword.lower() or keyword.lower() in term:
-                matching_keywords.append(term)
-                break
-        
-        # Fuzzy match for industry categories
-        for industry in INDUSTRY_CATEGORIES.keys():
-            # Simple fuzzy match: if term is contained in industry or vice versa
-            if term in industry.lower() or industry.lower() in term:
-                matching_keywords.append(term)
-                break
 
-    # Check if keyword parameter is provided and valid
-    if keyword:
-        if keyword in NEWS_KEYWORDS:
-            matching_keywords.append(keyword)
-        else:
-            # Log invalid keyword but continue with search
-            logger.warning(f"Invalid keyword provided: {keyword}")
-    
-    # Check if industry parameter is provided and valid
-    if industry:
-        if industry in INDUSTRY_CATEGORIES:
-            for keyword in INDUSTRY_CATEGORIES[industry]:
-                matching_keywords.append(keyword)
-        else:
-            # Log invalid industry but continue with search
-            logger.warning(f"Invalid industry provided: {industry}")
+    facet_names = _parse_facets(facets)
 
-    deduplicated_keywords = list(set(matching_keywords))
+    # Serve repeated requests from the in-process cache. Cursor pages are
+    # tied to a point in time and are never cached.
+    cache_key = None
+    if not cursor:
+        cache_key = NewsService.search_cache_key(q, keyword, industry, page, limit, sort_by, sort_order, view, facet_names)
+        cached_body = search_cache.get(cache_key)
+        if cached_body is not None:
+            return FastJSONResponse(content=cached_body)
+    # Remember the generation so a write during the search does not get cached over
+    cache_generation = search_cache.generation
+    
+    deduplicated_keywords, filter_keywords, valid_industry = _resolve_search_keywords(q, keyword, industry)
     
     # Perform the search
-    result = await NewsService.search_news(q, deduplicated_keywords, page, limit, sort_by, sort_order)
+    try:
+        result = await NewsService.search_news(
+            q, filter_keywords, page, limit, sort_by, sort_order, cursor, view,
+            raw=True, facets=facet_names, industry=valid_industry
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
      
-    # Transform articles to include image URLs
+    # Build the response payloads straight from the stored documents, including image URLs
+    response_model = NewsArticleCompactResponse if view == "compact" else NewsArticleResponse
     articles_with_images = [
-        NewsArticleResponse.from_article(article, deduplicated_keywords) 
+        response_model.payload_from_document(article, deduplicated_keywords)
         for article in result["articles"]
     ]
     
     # Return the updated result
-    return {
+    response = {
         "total": result["total"],
         "page": result["page"],
         "limit": result["limit"],
         "articles": articles_with_images
     }
+    if "total_relation" in result:
+        response["total_relation"] = result["total_relation"]
+    if "facets" in result:
+        response["facets"] = result["facets"]
+    if "next_cursor" in result:
+        response["next_cursor"] = result["next_cursor"]
+
+    # Everything in the payload is already a JSON type, so skip jsonable_encoder
+    body = dumps_json(response)
+    if cache_key is not None:
+        search_cache.set(cache_key, body, generation=cache_generation)
+    return FastJSONResponse(content=body)
+
+@app.post("/api/news/search/batch", tags=["news"])
+async def search_news_batch(batch: NewsSearchBatchRequest, api_key: str = Depends(get_api_key)):
+    """
+    Run several searches in one request and one Elasticsearch round trip.
+    Results are returned in request order; a failed search yields an error
+    entry without failing the others.
+    """
+    resolved_per_search = [
+        _resolve_search_keywords(spec.q, spec.keyword, spec.industry)
+        for spec in batch.searches
+    ]
+    facets_per_search = [_parse_facets(spec.facets) for spec in batch.searches]
+    results = await NewsService.multi_search_news(
+        [
+            {
+                "query": spec.q,
+                "keywords": filter_keywords,
+                "industry": industry,
+                "page": spec.page,
+                "limit": spec.limit,
+                "sort_by": spec.sort_by,
+                "sort_order": spec.sort_order,
+                "view": spec.view,
+                "facets": facets
+            }
+            for spec, (_, filter_keywords, industry), facets in zip(batch.searches, resolved_per_search, facets_per_search)
+        ],
+        raw=True
+    )
+
+    response = []
+    for spec, (keywords, _, _), result in zip(batch.searches, resolved_per_search, results):
+        if "error" in result:
+            response.append(result)
+            continue
+
+        response_model = NewsArticleCompactResponse if spec.view == "compact" else NewsArticleResponse
+        item = {
+            "total": result["total"],
+            "page": result["page"],
+            "limit": result["limit"],
+            "articles": [response_model.payload_from_document(article, keywords) for article in result["articles"]]
+        }
+        if "total_relation" in result:
+            item["total_relation"] = result["total_relation"]
+        if "facets" in result:
+            item["facets"] = result["facets"]
+        response.append(item)
+
+    return FastJSONResponse(content=dumps_json({"results": response}))
+
+@app.post("/api/news/batch-get", tags=["news"])
+async def get_news_batch(batch: NewsBatchGetRequest, api_key: str = Depends(get_api_key)):
+    """
+    Fetch many articles by ID in one Elasticsearch round trip.
+    Articles are returned in request order with null for IDs that don't
+    exist; those IDs are also listed under "missing".
+    """
+    documents = await NewsService.get_news_by_ids(batch.ids, raw=True)
+    articles = [
+        NewsArticleResponse.payload_from_document(document, document.get("tags", [])) if document else None
+        for document in documents
+    ]
+    missing = [article_id for article_id, document in zip(batch.ids, documents) if document is None]
+
+    return FastJSONResponse(content=dumps_json({
+        "total": len(batch.ids),
+        "found": len(batch.ids) - len(missing),
+        "articles": articles,
+        "missing": missing
+    }))
+
+@app.get("/api/news/suggest", tags=["news"])
+async def suggest_news_titles(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Title prefix typed so far"),
+    limit: int = Query(5, ge=1, le=10, description="Maximum number of suggestions"),
+    api_key: str = Depends(get_api_key)
+):
+    """
+    Suggest article titles for typeahead. Returns only ids and titles.
+
+    Suggestions are cached for SUGGEST_CACHE_TTL_SECONDS and are not dropped
+    on writes, so new titles can take that long to show up.
+    """
+    cache_key = (" ".join(prefix.lower().split()), limit)
+    cached_body = suggest_cache.get(cache_key)
+    if cached_body is not None:
+        return FastJSONResponse(content=cached_body)
+
+    suggestions = await NewsService.suggest_titles(prefix, limit)
+
+    body = dumps_json({"suggestions": suggestions})
+    suggest_cache.set(cache_key, body)
+    return FastJSONResponse(content=body)
+
+@app.get("/api/news/export", tags=["news"])
+async def export_news(
+    q: Optional[str] = Query(None, description="Optional search query"),
+    industry: Optional[str] = Query(None, description="Filter by industry category"),
+    from_date: Optional[datetime] = Query(None, description="Only include articles published on or after this date"),
+    to_date: Optional[datetime] = Query(None, description="Only include articles published before this date"),
+    api_key: str = Depends(get_api_key)
+):
+    """
+    Stream every matching article as newline-delimited JSON (NDJSON).
+    """
+    if industry and industry not in INDUSTRY_CATEGORIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid industry category. Available categories: {list(INDUSTRY_CATEGORIES.keys())}"
+        )
+
+    try:
+        stream = NewsService.export_news(q, industry, from_date, to_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(stream, media_type="application/x-ndjson")
 
 @app.get("/api/news/{article_id}", response_model=NewsArticleResponse, tags=["news"])
-async def get_news(article_id: str, api_key: str = Depends(get_api_key)):
+async def get_news(
+    article_id: str,
+    if_none_match: Optional[str] = Header(None),
+    api_key: str = Depends(get_api_key)
+):
     """
     Get a specific news article by ID.
+
+    Responses carry an ETag; send it back in If-None-Match to get an empty
+    304 when the article hasn't changed.
     """
-    article = await NewsService.get_news_by_id(article_id)
-    if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
-    
-    # Transform to include image URL
-    return NewsArticleResponse.from_article(article, article.tags)
+    cached = article_cache.get(article_id)
+    if cached is None:
+        # Remember the discard sequence so a write during the fetch does not get cached over
+        discard_sequence = article_cache.discard_sequence
+        document = await NewsService.get_news_by_id(article_id, raw=True)
+        if not document:
+            raise HTTPException(status_code=404, detail="Article not found")
+
+        # Transform to include image URL
+        body = dumps_json(NewsArticleResponse.payload_from_document(document, document.get("tags", [])))
+        cached = (_article_etag(document), body)
+        article_cache.set(article_id, cached, discard_sequence=discard_sequence)
+
+    etag, body = cached
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(content=body, headers=headers)
 
 @app.post("/api/news", response_model=NewsArticleResponse, status_code=201, tags=["news"])
 async def create_news(article: NewsArticleCreate, api_key: str = Depends(get_api_key)):
@@ -175,17 +415,71 @@ async def create_news(article: NewsArticleCreate, api_key: str = Depends(get_api
     # Transform to include image URL
     return NewsArticleResponse.from_article(created_article, created_article.tags)
 
+@app.post("/api/news/bulk", tags=["news"])
+async def bulk_create_news(
+    batch: NewsArticleBulkCreate,
+    chunk_size: Optional[int] = Query(None, ge=1, le=5000, description="Documents per bulk request"),
+    refresh: bool = Query(False, description="Refresh the index once after the batch so articles are immediately searchable"),
+    api_key: str = Depends(get_api_key)
+):
+    """
+    Create or update many news articles in one request.
+    Articles are deduplicated by URL as in single-article creation.
+    Returns a result per article, in request order.
+    """
+    if len(batch.articles) > settings.BULK_MAX_ARTICLES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many articles in one request (max {settings.BULK_MAX_ARTICLES})"
+        )
+
+    return await NewsService.bulk_create_news(batch.articles, chunk_size, refresh)
+
 @app.put("/api/news/{article_id}", response_model=NewsArticleResponse, tags=["news"])
-async def update_news(article_id: str, article: NewsArticleUpdate, api_key: str = Depends(get_api_key)):
+async def update_news(
+    article_id: str,
+    article: NewsArticleUpdate,
+    if_seq_no: Optional[int] = Query(None, ge=0, description="Only update if the article is at this sequence number"),
+    if_primary_term: Optional[int] = Query(None, ge=1, description="Primary term that goes with if_seq_no"),
+    if_match: Optional[str] = Header(None),
+    api_key: str = Depends(get_api_key)
+):
     """
     Update an existing news article.
+
+    Pass if_seq_no and if_primary_term for optimistic concurrency; the update
+    is rejected with 409 if the article changed since that version. An
+    If-Match header with the ETag from GET works the same way and fails with 412.
+    The response carries the ETag of the new version, unless the update was queued.
     """
-    updated_article = await NewsService.update_news(article_id, article)
+    if if_match and if_match.strip() != "*" and if_seq_no is None:
+        version = _version_from_etag(if_match)
+        if version is None:
+            raise HTTPException(status_code=412, detail="If-Match does not name a current article version")
+        if_seq_no, if_primary_term = version
+    if (if_seq_no is None) != (if_primary_term is None):
+        raise HTTPException(status_code=400, detail="Pass if_seq_no and if_primary_term together")
+    try:
+        updated_article = await NewsService.update_news(
+            article_id,
+            article,
+            if_seq_no=if_seq_no,
+            if_primary_term=if_primary_term,
+            raw=True
+        )
+    except ConflictError:
+        if if_match:
+            raise HTTPException(status_code=412, detail="Article was modified by another request")
+        raise HTTPException(status_code=409, detail="Article was modified by another request")
     if not updated_article:
         raise HTTPException(status_code=404, detail="Article not found")
-    
+
+    headers = {}
+    if updated_article.get("_seq_no") is not None:
+        headers["ETag"] = _article_etag(updated_article)
     # Transform to include image URL
-    return NewsArticleResponse.from_article(updated_article, updated_article.tags)
+    body = dumps_json(NewsArticleResponse.payload_from_document(updated_article, updated_article.get("tags", [])))
+    return FastJSONResponse(content=body, headers=headers)
 
 @app.delete("/api/news/{article_id}", tags=["news"])
 async def delete_news(article_id: str, api_key: str = Depends(get_api_key)):
@@ -353,10 +647,11 @@ async def get_india_business_stats(
         }
     }
     
-    # Execute the query
+    # Pre-filter every shard so partitions with no articles in the timeframe are skipped
     response = await es.search(
-        index=settings.NEWS_INDEX,
-        body=query
+        index=read_index(),
+        body=query,
+        pre_filter_shard_size=1
     )
     
     # Extract statistics
@@ -391,6 +686,43 @@ async def get_india_business_stats(
     
     return stats
 
+@app.post("/api/admin/synonyms/reload", tags=["admin"])
+async def reload_synonyms(api_key: str = Depends(get_api_key)):
+    """
+    Reload search-time synonyms after the synonyms file was updated on the
+    Elasticsearch nodes. Takes effect for new searches without reindexing.
+    """
+    details = await NewsService.reload_synonyms()
+    return {"indices": details}
+
+@app.get("/api/stats/cache", tags=["stats"])
+async def get_cache_stats(api_key: str = Depends(get_api_key)):
+    """
+    Get hit, miss and eviction counters for the in-process search, suggestion and article caches.
+    """
+    return {"search": search_cache.stats(), "suggest": suggest_cache.stats(), "article": article_cache.stats()}
+
+@app.get("/api/stats/elasticsearch", tags=["stats"])
+async def get_elasticsearch_stats(api_key: str = Depends(get_api_key)):
+    """
+    Get circuit breaker state and connection pool usage of the Elasticsearch client.
+    """
+    return client_stats()
+
+@app.get("/api/stats/coalescing", tags=["stats"])
+async def get_coalescing_stats(api_key: str = Depends(get_api_key)):
+    """
+    Get counters for identical concurrent searches that shared one Elasticsearch call.
+    """
+    return {"search": search_flight.stats()}
+
+@app.get("/api/stats/queries", tags=["stats"])
+async def get_query_stats(api_key: str = Depends(get_api_key)):
+    """
+    Get counters for free-text queries the query guard rewrote or rejected as too expensive.
+    """
+    return query_guard.stats()
+
 # User Subscription Routes
 # User Subscription Routes
 
@@ -0,0 +1,151 @@
+# app/core/cache.py
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from app.core.config import settings
+
+
+class ResponseCache:
+    """
+    Bounded in-process LRU cache with a per-entry TTL.
+
+    Entries are tagged with the cache generation at the time they were
+    computed. invalidate() bumps the generation, which makes every existing
+    entry stale without walking the cache; stale entries are dropped lazily
+    the next time they are read.
+
+    discard() drops a single key and records when it did, so a value read
+    before the discard (see discard_sequence) is not stored over it.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.generation = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        # Sequence number of the latest discard of each recently discarded key
+        self.discard_sequence = 0
+        self._discarded: "OrderedDict[Hashable, int]" = OrderedDict()
+        # Highest sequence number forgotten from _discarded
+        self._discard_floor = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value for key, or None if it is missing, expired or stale.
+        """
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        generation, expires_at, value = entry
+        if generation != self.generation or expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        generation: Optional[int] = None,
+        discard_sequence: Optional[int] = None
+    ) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            generation: Generation observed before the value was computed. If a
+                write happened since then, the value is not stored.
+            discard_sequence: discard_sequence observed before the value was
+                computed. If key was discarded since then, the value is not stored.
+        """
+        if not self.enabled:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        if discard_sequence is not None and self._discarded_since(key, discard_sequence):
+            return
+
+        self._entries[key] = (self.generation, time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self) -> None:
+        """Mark every cached entry as stale."""
+        self.generation += 1
+        self.invalidations += 1
+
+    def discard(self, key: Hashable) -> None:
+        """Drop a single entry, leaving the rest of the cache valid."""
+        self._entries.pop(key, None)
+
+        self.discard_sequence += 1
+        self._discarded[key] = self.discard_sequence
+        self._discarded.move_to_end(key)
+        while len(self._discarded) > self.max_entries:
+            # Forgetting a key only makes later fills more cautious, never stale
+            _, sequence = self._discarded.popitem(last=False)
+            self._discard_floor = max(self._discard_floor, sequence)
+
+    def _discarded_since(self, key: Hashable, sequence: int) -> bool:
+        return self._discarded.get(key, 0) > sequence or self._discard_floor > sequence
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+
+# Serialized /api/news/search responses, invalidated by NewsRepository writes
+search_cache = ResponseCache(
+    max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+    enabled=settings.SEARCH_CACHE_ENABLED
+)
+
+# Serialized /api/news/suggest responses; only expired by TTL, so write bursts
+# from the scraper don't empty it on every keystroke-heavy typeahead session
+suggest_cache = ResponseCache(
+    max_entries=settings.SUGGEST_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SUGGEST_CACHE_TTL_SECONDS,
+    enabled=settings.SUGGEST_CACHE_ENABLED
+)
+
+# Serialized GET /api/news/{id} responses with their ETag, dropped per id on write
+article_cache = ResponseCache(
+    max_entries=settings.ARTICLE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.ARTICLE_CACHE_TTL_SECONDS,
+    enabled=settings.ARTICLE_CACHE_ENABLED
+)
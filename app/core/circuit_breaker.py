@@ -0,0 +1,85 @@
+# app/core/circuit_breaker.py
+import time
+from typing import Any, Dict
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend whose circuit breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is unavailable; retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Fail fast while a backend keeps failing.
+
+    After failure_threshold consecutive failures the breaker opens and
+    allow() rejects calls for reset_seconds. Then one trial call is let
+    through per reset_seconds (half-open): a success closes the breaker,
+    a failure keeps it open.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_seconds: float = 30, enabled: bool = True):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.enabled = enabled
+        self.consecutive_failures = 0
+        self._open = False
+        self._retry_at = 0.0
+        self.opens = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if not self._open:
+            return "closed"
+        return "half_open" if time.monotonic() >= self._retry_at else "open"
+
+    def retry_after(self) -> float:
+        """Seconds until the next trial call is allowed."""
+        return max(0.0, self._retry_at - time.monotonic()) if self._open else 0.0
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go ahead now. Admitting a half-open trial call
+        pushes the next trial back by reset_seconds.
+        """
+        if not self.enabled or not self._open:
+            return True
+        now = time.monotonic()
+        if now >= self._retry_at:
+            self._retry_at = now + self.reset_seconds
+            return True
+        self.rejected += 1
+        return False
+
+    def check(self) -> None:
+        """Raise CircuitOpenError if a call may not go ahead now."""
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_after())
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._open = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self._open or self.consecutive_failures >= self.failure_threshold:
+            if not self._open:
+                self.opens += 1
+            self._open = True
+            self._retry_at = time.monotonic() + self.reset_seconds
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_seconds": self.reset_seconds,
+            "opens": self.opens,
+            "rejected": self.rejected
+        }
@@ -13,7 +13,70 @@ class Settings(BaseModel):
     ELASTICSEARCH_URL: str = os.getenv("ELASTICSEARCH_URL", "http://localhost:9200")
     ELASTICSEARCH_USERNAME: str = os.getenv("ELASTICSEARCH_USERNAME", "")
     ELASTICSEARCH_PASSWORD: str = os.getenv("ELASTICSEARCH_PASSWORD", "")
+    ELASTICSEARCH_CONNECTIONS_PER_NODE: int = int(os.getenv("ELASTICSEARCH_CONNECTIONS_PER_NODE", "25"))
+    ELASTICSEARCH_REQUEST_TIMEOUT: float = float(os.getenv("ELASTICSEARCH_REQUEST_TIMEOUT", "10"))
+    ELASTICSEARCH_MAX_RETRIES: int = int(os.getenv("ELASTICSEARCH_MAX_RETRIES", "2"))
+    ELASTICSEARCH_RETRY_ON_TIMEOUT: bool = os.getenv("ELASTICSEARCH_RETRY_ON_TIMEOUT", "True") == "True"
+    ELASTICSEARCH_DEAD_NODE_BACKOFF_SECONDS: float = float(os.getenv("ELASTICSEARCH_DEAD_NODE_BACKOFF_SECONDS", "1"))
+    ELASTICSEARCH_HTTP_COMPRESS: bool = os.getenv("ELASTICSEARCH_HTTP_COMPRESS", "True") == "True"
+    ELASTICSEARCH_SNIFF_ON_START: bool = os.getenv("ELASTICSEARCH_SNIFF_ON_START", "False") == "True"
+    ELASTICSEARCH_SNIFF_ON_NODE_FAILURE: bool = os.getenv("ELASTICSEARCH_SNIFF_ON_NODE_FAILURE", "False") == "True"
+    ELASTICSEARCH_SNIFF_INTERVAL_SECONDS: float = float(os.getenv("ELASTICSEARCH_SNIFF_INTERVAL_SECONDS", "60"))
+    ELASTICSEARCH_BREAKER_ENABLED: bool = os.getenv("ELASTICSEARCH_BREAKER_ENABLED", "True") == "True"
+    ELASTICSEARCH_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("ELASTICSEARCH_BREAKER_FAILURE_THRESHOLD", "5"))
+    ELASTICSEARCH_BREAKER_RESET_SECONDS: float = float(os.getenv("ELASTICSEARCH_BREAKER_RESET_SECONDS", "30"))
     NEWS_INDEX: str = os.getenv("NEWS_INDEX", "news")
+    # "monthly" stores articles in NEWS_INDEX-YYYY.MM partitions behind the aliases below; "none" uses NEWS_INDEX
+    NEWS_INDEX_PARTITIONING: str = os.getenv("NEWS_INDEX_PARTITIONING", "none")
+    NEWS_READ_ALIAS: str = os.getenv("NEWS_READ_ALIAS", os.getenv("NEWS_INDEX", "news") + "-read")
+    NEWS_WRITE_ALIAS: str = os.getenv("NEWS_WRITE_ALIAS", os.getenv("NEWS_INDEX", "news") + "-write")
+    NEWS_INDEX_SHARDS: int = int(os.getenv("NEWS_INDEX_SHARDS", "1"))
+    NEWS_INDEX_REPLICAS: int = int(os.getenv("NEWS_INDEX_REPLICAS", "1"))
+    NEWS_INDEX_REFRESH_INTERVAL: str = os.getenv("NEWS_INDEX_REFRESH_INTERVAL", "1s")
+    NEWS_INDEX_CODEC: str = os.getenv("NEWS_INDEX_CODEC", "best_compression")
+    # Synonyms file, relative to the Elasticsearch config directory on every node
+    NEWS_SYNONYMS_PATH: str = os.getenv("NEWS_SYNONYMS_PATH", "analysis/india_business_synonyms.txt")
+    # Fields free text is matched against, with boosts; search_text holds title, summary and content
+    SEARCH_TEXT_FIELDS: str = os.getenv("SEARCH_TEXT_FIELDS", "title^3,search_text")
+    # "simple": simple_query_string with phrase, prefix and boolean operators; "text": plain multi_match
+    SEARCH_QUERY_MODE: str = os.getenv("SEARCH_QUERY_MODE", "simple")
+    SEARCH_MAX_QUERY_CLAUSES: int = int(os.getenv("SEARCH_MAX_QUERY_CLAUSES", "32"))
+    SEARCH_MAX_TERM_LENGTH: int = int(os.getenv("SEARCH_MAX_TERM_LENGTH", "64"))
+    SEARCH_MIN_PREFIX_LENGTH: int = int(os.getenv("SEARCH_MIN_PREFIX_LENGTH", "3"))
+    SEARCH_TRACK_TOTAL_HITS: int = int(os.getenv("SEARCH_TRACK_TOTAL_HITS", "1000"))
+    SEARCH_CURSOR_KEEP_ALIVE: str = os.getenv("SEARCH_CURSOR_KEEP_ALIVE", "2m")
+    SEARCH_SNIPPET_LENGTH: int = int(os.getenv("SEARCH_SNIPPET_LENGTH", "160"))
+    SEARCH_COALESCING_ENABLED: bool = os.getenv("SEARCH_COALESCING_ENABLED", "True") == "True"
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+    # Bulk ingestion settings
+    BULK_CHUNK_SIZE: int = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+    BULK_MAX_RETRIES: int = int(os.getenv("BULK_MAX_RETRIES", "2"))
+    BULK_MAX_ARTICLES: int = int(os.getenv("BULK_MAX_ARTICLES", "1000"))
+
+    # Write policies ("immediate", "wait_for" or "async") per caller
+    WRITE_POLICY_CREATE: str = os.getenv("WRITE_POLICY_CREATE", "wait_for")
+    WRITE_POLICY_UPDATE: str = os.getenv("WRITE_POLICY_UPDATE", "wait_for")
+    WRITE_POLICY_DELETE: str = os.getenv("WRITE_POLICY_DELETE", "wait_for")
+    WRITE_POLICY_SCRAPER: str = os.getenv("WRITE_POLICY_SCRAPER", "async")
+    WRITE_BUFFER_MAX_ACTIONS: int = int(os.getenv("WRITE_BUFFER_MAX_ACTIONS", "500"))
+    WRITE_BUFFER_FLUSH_SECONDS: float = float(os.getenv("WRITE_BUFFER_FLUSH_SECONDS", "5"))
+    WRITE_BUFFER_MAX_PENDING: int = int(os.getenv("WRITE_BUFFER_MAX_PENDING", "10000"))
+
+    # Search result cache settings
+    SEARCH_CACHE_ENABLED: bool = os.getenv("SEARCH_CACHE_ENABLED", "True") == "True"
+    SEARCH_CACHE_MAX_ENTRIES: int = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1024"))
+    SEARCH_CACHE_TTL_SECONDS: int = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "60"))
+
+    # Title suggestion cache settings
+    SUGGEST_CACHE_ENABLED: bool = os.getenv("SUGGEST_CACHE_ENABLED", "True") == "True"
+    SUGGEST_CACHE_MAX_ENTRIES: int = int(os.getenv("SUGGEST_CACHE_MAX_ENTRIES", "4096"))
+    SUGGEST_CACHE_TTL_SECONDS: int = int(os.getenv("SUGGEST_CACHE_TTL_SECONDS", "30"))
+
+    # Article detail cache settings
+    ARTICLE_CACHE_ENABLED: bool = os.getenv("ARTICLE_CACHE_ENABLED", "True") == "True"
+    ARTICLE_CACHE_MAX_ENTRIES: int = int(os.getenv("ARTICLE_CACHE_MAX_ENTRIES", "4096"))
+    ARTICLE_CACHE_TTL_SECONDS: int = int(os.getenv("ARTICLE_CACHE_TTL_SECONDS", "300"))
     
     # CORS
     CORS_ORIGINS: List[str] = [
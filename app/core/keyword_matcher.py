@@ -0,0 +1,138 @@
+# app/core/keyword_matcher.py
+import re
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple
+
+from app.core.constants import INDUSTRY_CATEGORIES, NEWS_KEYWORDS
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for keyword matching: lowercase and collapse whitespace.
+    """
+    if not text:
+        return ""
+    return _WHITESPACE_RE.sub(" ", text.lower()).strip()
+
+
+class KeywordMatches(NamedTuple):
+    keywords: List[str]
+    industries: List[str]
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over the normalized keyword and industry vocabulary.
+
+    The automaton is built once; matching a query is a single pass over its
+    characters regardless of how many keywords are configured. Matches only
+    count when they start and end on a word boundary, so "sez" does not match
+    inside "seize".
+    """
+
+    def __init__(self, keywords: Iterable[str], industries: Iterable[str]):
+        # Each pattern maps to (canonical value, is_industry)
+        self._patterns: List[tuple] = []
+        self._keyword_lookup: Dict[str, str] = {}
+        self._industry_lookup: Dict[str, str] = {}
+
+        for keyword in keywords:
+            normalized = normalize_text(keyword)
+            if normalized and normalized not in self._keyword_lookup:
+                self._keyword_lookup[normalized] = keyword
+                self._patterns.append((normalized, keyword, False))
+
+        for industry in industries:
+            normalized = normalize_text(industry)
+            if normalized and normalized not in self._industry_lookup:
+                self._industry_lookup[normalized] = industry
+                self._patterns.append((normalized, industry, True))
+
+        self._build()
+
+    def _build(self) -> None:
+        # State 0 is the root; goto/fail/output are indexed by state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for pattern_id, (pattern, _, _) in enumerate(self._patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._output[state].append(pattern_id)
+
+        # Breadth-first pass to compute failure links and merge outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state].extend(self._output[self._fail[next_state]])
+
+    def match(self, text: str) -> KeywordMatches:
+        """
+        Find every keyword and industry that occurs in the text.
+
+        Args:
+            text: Free text, typically a search query
+
+        Returns:
+            KeywordMatches with canonical keywords and industries, in order of
+            first occurrence and without duplicates
+        """
+        normalized = normalize_text(text)
+        keywords: List[str] = []
+        industries: List[str] = []
+        if not normalized:
+            return KeywordMatches(keywords, industries)
+
+        seen = set()
+        state = 0
+        length = len(normalized)
+        for end, char in enumerate(normalized):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+
+            for pattern_id in self._output[state]:
+                if pattern_id in seen:
+                    continue
+                pattern, canonical, is_industry = self._patterns[pattern_id]
+                start = end - len(pattern) + 1
+                if start > 0 and normalized[start - 1].isalnum():
+                    continue
+                if end + 1 < length and normalized[end + 1].isalnum():
+                    continue
+                seen.add(pattern_id)
+                if is_industry:
+                    industries.append(canonical)
+                else:
+                    keywords.append(canonical)
+
+        return KeywordMatches(keywords, industries)
+
+    def canonical_keyword(self, keyword: str):
+        """Return the configured spelling of a keyword, matched case-insensitively."""
+        return self._keyword_lookup.get(normalize_text(keyword))
+
+    def canonical_industry(self, industry: str):
+        """Return the configured spelling of an industry, matched case-insensitively."""
+        return self._industry_lookup.get(normalize_text(industry))
+
+
+# Built once at import time from the static vocabulary in constants.py
+keyword_matcher = KeywordMatcher(NEWS_KEYWORDS, INDUSTRY_CATEGORIES.keys())
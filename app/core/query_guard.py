@@ -0,0 +1,116 @@
+# app/core/query_guard.py
+import logging
+import re
+from typing import Any, Dict, List
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Operators simple_query_string may interpret with SIMPLE_QUERY_FLAGS.
+# FUZZY, NEAR and SLOP are left out: they expand terms on the shards.
+SIMPLE_QUERY_FLAGS = "AND|OR|NOT|PHRASE|PREFIX|PRECEDENCE|WHITESPACE|ESCAPE"
+
+# Characters that start a term in simple_query_string syntax
+_TERM_START = r'(^|[\s+|\-("])'
+
+
+class QueryRejectedError(ValueError):
+    """Raised for a free-text query that is too expensive to send to Elasticsearch."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class QueryGuard:
+    """
+    Check free-text queries before they reach the cluster.
+
+    Cheap fixes are applied by rewriting the query: leading wildcards are
+    dropped and prefix searches on very short stems become plain terms.
+    Queries with too many terms or overlong terms are rejected.
+    """
+
+    def __init__(self, max_clauses: int = 32, max_term_length: int = 64, min_prefix_length: int = 3):
+        self.max_clauses = max_clauses
+        self.max_term_length = max_term_length
+        self.min_prefix_length = min_prefix_length
+        self._leading_wildcard = re.compile(_TERM_START + r'[*?]+')
+        self._short_prefix = re.compile(
+            _TERM_START + r'([^\s+|\-("*]{1,%d})\*' % max(1, min_prefix_length - 1)
+        ) if min_prefix_length > 1 else None
+        self.checked = 0
+        self.rewritten = 0
+        self.rejected = 0
+        self.rejected_by_reason: Dict[str, int] = {}
+
+    @staticmethod
+    def terms(query: str) -> List[str]:
+        """Split a query into its terms, without operators or phrase quotes."""
+        tokens = (token.lstrip("-").rstrip("*") for token in re.split(r'[\s+|()"]+', query))
+        return [token for token in tokens if token]
+
+    def check(self, query: str) -> str:
+        """
+        Validate a free-text query and rewrite its expensive parts.
+
+        Args:
+            query: Free text entered by the user
+
+        Returns:
+            The query to send to Elasticsearch
+
+        Raises:
+            QueryRejectedError: If the query exceeds the clause or term length limits
+        """
+        if not query or not query.strip():
+            return query
+        self.checked += 1
+
+        rewritten = self._leading_wildcard.sub(r'\1', query)
+        if self._short_prefix is not None:
+            rewritten = self._short_prefix.sub(r'\1\2', rewritten)
+        if rewritten != query:
+            self.rewritten += 1
+            logger.info(f"Rewrote expensive query {query!r} to {rewritten!r}")
+
+        terms = self.terms(rewritten)
+        if len(terms) > self.max_clauses:
+            self._reject(
+                query, "too_many_clauses",
+                f"Query has {len(terms)} terms; at most {self.max_clauses} are allowed"
+            )
+        long_terms = [term for term in terms if len(term) > self.max_term_length]
+        if long_terms:
+            self._reject(
+                query, "term_too_long",
+                f"Query terms may be at most {self.max_term_length} characters long"
+            )
+        return rewritten
+
+    def _reject(self, query: str, reason: str, message: str) -> None:
+        self.rejected += 1
+        self.rejected_by_reason[reason] = self.rejected_by_reason.get(reason, 0) + 1
+        logger.warning(f"Rejected query ({reason}): {query[:200]!r}")
+        raise QueryRejectedError(reason, message)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": settings.SEARCH_QUERY_MODE,
+            "max_clauses": self.max_clauses,
+            "max_term_length": self.max_term_length,
+            "min_prefix_length": self.min_prefix_length,
+            "checked": self.checked,
+            "rewritten": self.rewritten,
+            "rejected": self.rejected,
+            "rejected_by_reason": dict(self.rejected_by_reason)
+        }
+
+
+# Free-text queries from search, batch search and export
+query_guard = QueryGuard(
+    max_clauses=settings.SEARCH_MAX_QUERY_CLAUSES,
+    max_term_length=settings.SEARCH_MAX_TERM_LENGTH,
+    min_prefix_length=settings.SEARCH_MIN_PREFIX_LENGTH
+)
@@ -0,0 +1,56 @@
+# app/core/serialization.py
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# orjson is optional; fall back to the standard library encoder without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Encode types the JSON backends don't handle natively."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    # HttpUrl, UUID, Decimal and similar types encode as their string form
+    return str(obj)
+
+
+def dumps_json(content: Any) -> bytes:
+    """
+    Encode content as compact UTF-8 JSON.
+
+    Uses orjson when installed; datetimes, pydantic models and HttpUrl
+    values are handled either way.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with dumps_json.
+
+    Content that is already encoded (bytes) is sent as-is, so cached
+    response bodies can be returned without decoding them first.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        return dumps_json(content)
@@ -0,0 +1,71 @@
+# app/core/singleflight.py
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key starts the call; callers that arrive while it
+    is still running await the same task and receive the same result (or
+    exception). Nothing is kept once the call finishes, so this never serves
+    stale data the way a cache can.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.peak_in_flight = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run func, or join an in-flight call with the same key.
+
+        Args:
+            key: Identity of the call; equal keys must mean equal results
+            func: Zero-argument coroutine function performing the call
+
+        Returns:
+            The result of the shared call
+        """
+        if not self.enabled:
+            return await func()
+
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            self.peak_in_flight = max(self.peak_in_flight, len(self._in_flight))
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+
+        # Shield the shared task so one cancelled caller doesn't cancel it for the rest
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Coalesced call failed: {task.exception()}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "saved_ratio": round(self.coalesced / self.calls, 4) if self.calls else 0.0,
+            "in_flight": len(self._in_flight),
+            "peak_in_flight": self.peak_in_flight
+        }
@@ -10,12 +10,76 @@ except ImportError:
         # Fallback
         raise ImportError("Could not import Elasticsearch. Make sure it's installed: pip install elasticsearch")
 
+try:
+    from elasticsearch import BadRequestError
+except ImportError:
+    # elasticsearch<8 names it RequestError
+    from elasticsearch import RequestError as BadRequestError
+
+try:
+    from elastic_transport import AsyncTransport, ConnectionError as TransportConnectionError, ConnectionTimeout
+    # Errors meaning the cluster couldn't be reached at all
+    UNAVAILABLE_ERRORS = (TransportConnectionError, ConnectionTimeout)
+except ImportError:
+    # elasticsearch<8 has no separate transport package; the client runs without the breaker
+    AsyncTransport = None
+    UNAVAILABLE_ERRORS = ()
+
 from app.core.config import settings
+from app.core.circuit_breaker import CircuitBreaker
+from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 es_client = None
 
+# Partitions this process has already created or seen
+_known_partitions = set()
+
+# Statuses that mean the cluster is overloaded or unavailable rather than the request being wrong
+UNHEALTHY_STATUSES = {429, 502, 503, 504}
+
+# Opens after repeated connection failures so requests fail fast instead of queueing on a sick cluster
+es_breaker = CircuitBreaker(
+    "Elasticsearch",
+    failure_threshold=settings.ELASTICSEARCH_BREAKER_FAILURE_THRESHOLD,
+    reset_seconds=settings.ELASTICSEARCH_BREAKER_RESET_SECONDS,
+    enabled=settings.ELASTICSEARCH_BREAKER_ENABLED
+)
+
+if AsyncTransport is not None:
+    class BreakerTransport(AsyncTransport):
+        """
+        Transport that consults es_breaker before each request and counts requests in flight.
+
+        Connection errors, timeouts (after the transport's own retries) and
+        overload statuses count as failures; any other response is a success.
+        """
+
+        requests = 0
+        in_flight = 0
+        peak_in_flight = 0
+
+        async def perform_request(self, method, target, **kwargs):
+            es_breaker.check()
+
+            BreakerTransport.requests += 1
+            BreakerTransport.in_flight += 1
+            BreakerTransport.peak_in_flight = max(BreakerTransport.peak_in_flight, BreakerTransport.in_flight)
+            try:
+                response = await super().perform_request(method, target, **kwargs)
+            except (TransportConnectionError, ConnectionTimeout):
+                es_breaker.record_failure()
+                raise
+            finally:
+                BreakerTransport.in_flight -= 1
+
+            if response.meta.status in UNHEALTHY_STATUSES:
+                es_breaker.record_failure()
+            else:
+                es_breaker.record_success()
+            return response
+
 def get_elasticsearch():
     return es_client
 
@@ -27,10 +91,27 @@ def init_elasticsearch():
             es_auth = {
                 "basic_auth": (settings.ELASTICSEARCH_USERNAME, settings.ELASTICSEARCH_PASSWORD)
             }
+
+        client_options = {
+            "connections_per_node": settings.ELASTICSEARCH_CONNECTIONS_PER_NODE,
+            "request_timeout": settings.ELASTICSEARCH_REQUEST_TIMEOUT,
+            "max_retries": settings.ELASTICSEARCH_MAX_RETRIES,
+            "retry_on_timeout": settings.ELASTICSEARCH_RETRY_ON_TIMEOUT,
+            "retry_on_status": (502, 503, 504),
+            "dead_node_backoff_factor": settings.ELASTICSEARCH_DEAD_NODE_BACKOFF_SECONDS,
+            "http_compress": settings.ELASTICSEARCH_HTTP_COMPRESS,
+            "sniff_on_start": settings.ELASTICSEARCH_SNIFF_ON_START,
+            "sniff_on_node_failure": settings.ELASTICSEARCH_SNIFF_ON_NODE_FAILURE,
+        }
+        if settings.ELASTICSEARCH_SNIFF_ON_START or settings.ELASTICSEARCH_SNIFF_ON_NODE_FAILURE:
+            client_options["min_delay_between_sniffing"] = settings.ELASTICSEARCH_SNIFF_INTERVAL_SECONDS
+        if AsyncTransport is not None:
+            client_options["transport_class"] = BreakerTransport
         
         es_client = AsyncElasticsearch(
             settings.ELASTICSEARCH_URL,
-            **es_auth
+            **es_auth,
+            **client_options
         )
         logger.info("Connected to Elasticsearch")
     
@@ -40,85 +121,251 @@ def init_elasticsearch():
         logger.error(f"Error connecting to Elasticsearch: {e}")
         raise e
 
-async def create_index_if_not_exists():
-    if not await es_client.indices.exists(index=settings.NEWS_INDEX):
-        # Define the mapping for the news articles
-        mapping = {
-            "mappings": {
-                "properties": {
-                    "title": {"type": "text", "analyzer": "business_india_analyzer"},
-                    "content": {"type": "text", "analyzer": "business_india_analyzer"},
-                    "summary": {"type": "text", "analyzer": "business_india_analyzer"},
-                    "author": {"type": "keyword"},
-                    "source": {"type": "keyword"},
-                    "published_date": {"type": "date"},
-                    "categories": {"type": "keyword"},
-                    "tags": {"type": "keyword"},
-                    "url": {"type": "keyword"},
-                    "normalized_url": {
-                        "type": "keyword",
-                        "normalizer": "lowercase"  # Use lowercase normalizer for case-insensitive matching
+def client_stats() -> dict:
+    """
+    Circuit breaker state, request concurrency and node pool health of the client.
+    """
+    stats = {"breaker": es_breaker.stats()}
+    if AsyncTransport is not None:
+        nodes_total = nodes_alive = 0
+        if es_client is not None:
+            node_pool = es_client.transport.node_pool
+            nodes_total = len(node_pool.all())
+            nodes_alive = len(getattr(node_pool, "_alive_nodes", node_pool.all()))
+        capacity = nodes_alive * settings.ELASTICSEARCH_CONNECTIONS_PER_NODE
+        stats["pool"] = {
+            "nodes": nodes_total,
+            "alive_nodes": nodes_alive,
+            "dead_nodes": nodes_total - nodes_alive,
+            "connections_per_node": settings.ELASTICSEARCH_CONNECTIONS_PER_NODE,
+            "requests": BreakerTransport.requests,
+            "in_flight": BreakerTransport.in_flight,
+            "peak_in_flight": BreakerTransport.peak_in_flight,
+            "utilization": round(BreakerTransport.in_flight / capacity, 4) if capacity else 0.0
+        }
+    return stats
+
+def news_index_body() -> dict:
+    """
+    Mappings and settings for a news index (the single index or one monthly partition).
+
+    Index sort and codec can only be set when an index is created; use
+    scripts/reindex.py to apply changes to existing indices.
+    """
+    return {
+        "mappings": {
+            "properties": {
+                "title": {
+                    "type": "text",
+                    "analyzer": "business_india_analyzer",
+                    "search_analyzer": "business_india_search_analyzer",
+                    "copy_to": "search_text",
+                    "fields": {
+                        # Prefix lookups for typeahead, served from an in-memory FST
+                        "suggest": {"type": "completion"}
+                    }
+                },
+                "content": {
+                    "type": "text",
+                    "analyzer": "business_india_analyzer",
+                    "search_analyzer": "business_india_search_analyzer",
+                    "copy_to": "search_text"
+                },
+                "summary": {
+                    "type": "text",
+                    "analyzer": "business_india_analyzer",
+                    "search_analyzer": "business_india_search_analyzer",
+                    "copy_to": "search_text"
+                },
+                # Title, summary and content in one field, so free text is matched against
+                # a single inverted index instead of every field in the mapping
+                "search_text": {
+                    "type": "text",
+                    "analyzer": "business_india_analyzer",
+                    "search_analyzer": "business_india_search_analyzer"
+                },
+                "author": {"type": "keyword"},
+                "source": {"type": "keyword"},
+                "published_date": {"type": "date"},
+                "categories": {"type": "keyword"},
+                "tags": {"type": "keyword"},
+                "url": {"type": "keyword"},
+                "normalized_url": {
+                    "type": "keyword",
+                    "normalizer": "lowercase"  # Use lowercase normalizer for case-insensitive matching
+                },
+                "created_at": {"type": "date"},
+                "updated_at": {"type": "date"},
+                # New fields for India and business relevance
+                "india_relevance": {"type": "float"},
+                "business_relevance": {"type": "float"}
+            }
+        },
+        "settings": {
+            "number_of_shards": settings.NEWS_INDEX_SHARDS,
+            "number_of_replicas": settings.NEWS_INDEX_REPLICAS,
+            "refresh_interval": settings.NEWS_INDEX_REFRESH_INTERVAL,
+            "codec": settings.NEWS_INDEX_CODEC,
+            # Segments sorted newest first, so newest-first browsing can stop early
+            "sort.field": ["published_date", "created_at"],
+            "sort.order": ["desc", "desc"],
+            "sort.missing": ["_last", "_last"],
+            "analysis": {
+                "filter": {
+                    # Applied at search time only, so changing synonyms needs a reload, not a reindex
+                    "india_business_synonym_filter": {
+                        "type": "synonym_graph",
+                        "synonyms_path": settings.NEWS_SYNONYMS_PATH,
+                        "updateable": True
                     },
-                    "created_at": {"type": "date"},
-                    "updated_at": {"type": "date"},
-                    # New fields for India and business relevance
-                    "india_relevance": {"type": "float"},
-                    "business_relevance": {"type": "float"}
-                }
-            },
-            "settings": {
-                "number_of_shards": 1,
-                "number_of_replicas": 1,
-                "analysis": {
-                    "filter": {
-                        "india_business_synonym_filter": {
-                            "type": "synonym",
-                            "synonyms": [
-                                "india, indian, bharat, desi, hindustani",
-                                "business, industry, commerce, trade, corporate, enterprise",
-                                "msme, micro small medium enterprise, small business",
-                                "startup, new business, venture",
-                                "make in india, manufactured in india, indian manufacturing",
-                                "digital india, digitalization india, india tech",
-                                "gst, goods and services tax",
-                                "rbi, reserve bank of india",
-                                "sebi, securities and exchange board of india",
-                                "economy, economic, financial, fiscal"
-                            ]
-                        },
-                        "english_stop": {
-                            "type": "stop",
-                            "stopwords": "_english_"
-                        },
-                        "english_stemmer": {
-                            "type": "stemmer",
-                            "language": "english"
-                        }
+                    "english_stop": {
+                        "type": "stop",
+                        "stopwords": "_english_"
                     },
-                    "analyzer": {
-                        "business_india_analyzer": {
-                            "type": "custom",
-                            "tokenizer": "standard",
-                            "filter": [
-                                "lowercase",
-                                "india_business_synonym_filter",
-                                "english_stop",
-                                "english_stemmer"
-                            ]
-                        }
+                    "english_stemmer": {
+                        "type": "stemmer",
+                        "language": "english"
+                    }
+                },
+                "analyzer": {
+                    "business_india_analyzer": {
+                        "type": "custom",
+                        "tokenizer": "standard",
+                        "filter": [
+                            "lowercase",
+                            "english_stop",
+                            "english_stemmer"
+                        ]
                     },
-                    "normalizer": {
-                        "lowercase": {
-                            "type": "custom",
-                            "filter": ["lowercase"]
-                        }
+                    "business_india_search_analyzer": {
+                        "type": "custom",
+                        "tokenizer": "standard",
+                        "filter": [
+                            "lowercase",
+                            "india_business_synonym_filter",
+                            "english_stop",
+                            "english_stemmer"
+                        ]
+                    }
+                },
+                "normalizer": {
+                    "lowercase": {
+                        "type": "custom",
+                        "filter": ["lowercase"]
                     }
                 }
             }
         }
-        
+    }
+
+def is_partitioned() -> bool:
+    return settings.NEWS_INDEX_PARTITIONING == "monthly"
+
+def partition_month(value: datetime = None) -> str:
+    """
+    Month key ("YYYY.MM") of a datetime, or of now when missing.
+
+    Articles are partitioned by the month they are first ingested in, so
+    the partition of an article never depends on its (editable, sometimes
+    missing or wrong) publication date.
+    """
+    return (value or datetime.utcnow()).strftime("%Y.%m")
+
+def partition_index(month: str) -> str:
+    """Name of the monthly partition index for a "YYYY.MM" month key."""
+    return f"{settings.NEWS_INDEX}-{month}"
+
+def read_index() -> str:
+    """Index or alias that searches should target."""
+    return settings.NEWS_READ_ALIAS if is_partitioned() else settings.NEWS_INDEX
+
+async def write_index() -> str:
+    """
+    Index or alias that new articles should be written to.
+
+    With partitioning this is the write alias, which always points at the
+    partition for the current (ingest) month; the alias is rolled over on
+    the first write of a new month.
+    """
+    if not is_partitioned():
+        return settings.NEWS_INDEX
+    if partition_index(partition_month()) not in _known_partitions:
+        await rollover_write_alias()
+    return settings.NEWS_WRITE_ALIAS
+
+async def ensure_partition(month: str) -> str:
+    """
+    Create the partition for a month if needed and return its name.
+
+    New partitions join the read alias; the partition for the current month
+    also becomes the write alias target (see rollover_write_alias). Only the
+    current month is ever created, so article dates can't create indices.
+    """
+    index = partition_index(month)
+    if index in _known_partitions:
+        return index
+
+    try:
+        await es_client.indices.create(
+            index=index,
+            body={**news_index_body(), "aliases": {settings.NEWS_READ_ALIAS: {}}}
+        )
+        logger.info(f"Created partition index: {index}")
+    except BadRequestError as e:
+        # Another process (API worker or data populator) created it first, or
+        # scripts/reindex.py moved it to a versioned index behind an alias of this name
+        if "already exists" not in str(e):
+            raise
+    _known_partitions.add(index)
+
+    if month == partition_month():
+        await rollover_write_alias()
+    return index
+
+async def rollover_write_alias() -> str:
+    """
+    Point the write alias at the current month's partition, creating it if needed.
+
+    The alias moves in one update_aliases call, so writers never see it
+    missing or on two indices. Returns the concrete current write index.
+    """
+    current = partition_index(partition_month())
+    if current not in _known_partitions:
+        return await ensure_partition(partition_month())
+
+    # After scripts/reindex.py the partition name is an alias of a versioned
+    # index ("news-YYYY.MM-v2"); aliases can only be added to concrete indices
+    resolved = list((await es_client.indices.get_alias(index=current)).keys())
+    if len(resolved) != 1:
+        raise RuntimeError(f"{current} resolves to {len(resolved)} indices; expected one")
+    current = resolved[0]
+
+    write_alias = settings.NEWS_WRITE_ALIAS
+    previous = []
+    if await es_client.indices.exists_alias(name=write_alias):
+        previous = list((await es_client.indices.get_alias(name=write_alias)).keys())
+    if previous == [current]:
+        return current
+
+    actions = [{"add": {"index": current, "alias": write_alias, "is_write_index": True}}]
+    actions += [{"remove": {"index": index, "alias": write_alias}} for index in previous if index != current]
+    await es_client.indices.update_aliases(actions=actions)
+    logger.info(f"Rolled write alias {write_alias} over to {current} (was {previous or 'unset'})")
+    return current
+
+async def create_index_if_not_exists():
+    if is_partitioned():
+        await rollover_write_alias()
+
+        # Keep articles from before partitioning searchable through the read alias
+        if await es_client.indices.exists(index=settings.NEWS_INDEX) and \
+                not await es_client.indices.exists_alias(name=settings.NEWS_READ_ALIAS, index=settings.NEWS_INDEX):
+            await es_client.indices.put_alias(index=settings.NEWS_INDEX, name=settings.NEWS_READ_ALIAS)
+        return
+
+    if not await es_client.indices.exists(index=settings.NEWS_INDEX):
         await es_client.indices.create(
             index=settings.NEWS_INDEX,
-            body=mapping
+            body=news_index_body()
         )
-        logger.info(f"Created index: {settings.NEWS_INDEX}")
\ No newline at end of file
+        logger.info(f"Created index: {settings.NEWS_INDEX}")
@@ -1,5 +1,11 @@
 from datetime import datetime
+import base64
+import hashlib
+import json
 import logging
+import re
+import uuid
+from collections import deque
 from urllib.parse import urlparse, urlunparse
 # Import using try/except to handle different elasticsearch versions
 try:
@@ -7,13 +13,86 @@ try:
 except ImportError:
     # Fallback for different versions
     NotFoundError = Exception  # Generic fallback
+try:
+    from elasticsearch import ConflictError
+except ImportError:
+    class ConflictError(Exception):
+        """Raised when a conditional write finds a newer version of the document."""
+from elasticsearch.helpers import async_streaming_bulk
 
-from app.db.elasticsearch import get_elasticsearch
+from app.db.elasticsearch import BadRequestError, get_elasticsearch, is_partitioned, read_index, write_index
 from app.core.config import settings
+from app.core.cache import article_cache, search_cache
+from app.db.write_buffer import WriteBehindBuffer, refresh_for_policy
+from app.core.singleflight import SingleFlight
+from app.core.query_guard import SIMPLE_QUERY_FLAGS
+from app.core.constants import INDUSTRY_CATEGORIES
 from app.models.news import NewsArticle, NewsArticleCreate, NewsArticleUpdate
 
 logger = logging.getLogger(__name__)
 
+# Fields fetched for compact list views; the content body stays on the cluster
+COMPACT_SOURCE_FIELDS = ["title", "summary", "source", "published_date"]
+
+# Painless script for URL-keyed upserts: new documents get created_at, existing
+# ones keep it, tags are merged and every other supplied field is overwritten
+UPSERT_SCRIPT = """
+if (ctx._source.created_at == null) {
+  ctx._source.created_at = params.now;
+}
+Set tags = new HashSet();
+if (ctx._source.tags != null) { tags.addAll(ctx._source.tags); }
+if (params.doc.tags != null) { tags.addAll(params.doc.tags); }
+for (entry in params.doc.entrySet()) {
+  ctx._source[entry.getKey()] = entry.getValue();
+}
+if (ctx._source.tags != null || params.doc.tags != null) {
+  ctx._source.tags = new ArrayList(tags);
+}
+ctx._source.updated_at = params.now;
+"""
+
+# Partial update that only bumps updated_at (and the document version) when a field changes
+UPDATE_SCRIPT = """
+boolean changed = false;
+for (entry in params.doc.entrySet()) {
+  if (ctx._source[entry.getKey()] != entry.getValue()) {
+    ctx._source[entry.getKey()] = entry.getValue();
+    changed = true;
+  }
+}
+if (changed) {
+  ctx._source.updated_at = params.now;
+} else {
+  ctx.op = 'noop';
+}
+"""
+
+# Facets that can be requested alongside search hits: name -> (field, bucket count)
+FACET_FIELDS = {
+    "categories": ("categories", 20),
+    "tags": ("tags", 30),
+    "sources": ("source", 20)
+}
+
+# Ids per lookup when resolving articles across partitions
+ID_LOOKUP_BATCH_SIZE = 1000
+
+# Fragments of Elasticsearch errors caused by an expired or malformed point in time id
+PIT_ERROR = re.compile(r"search[_ ]context|point[_ ]in[_ ]time|\bpit\b|invalid id", re.IGNORECASE)
+
+# Concurrent identical search bodies share one in-flight es.search call
+search_flight = SingleFlight(enabled=settings.SEARCH_COALESCING_ENABLED)
+
+# Pending writes made with the async write policy
+write_buffer = WriteBehindBuffer(
+    max_actions=settings.WRITE_BUFFER_MAX_ACTIONS,
+    flush_interval=settings.WRITE_BUFFER_FLUSH_SECONDS,
+    max_retries=settings.BULK_MAX_RETRIES,
+    prepare=lambda actions: NewsRepository._route_actions(actions),
+    max_pending=settings.WRITE_BUFFER_MAX_PENDING
+)
+
 class NewsRepository:
     @staticmethod
     def _normalize_url(url):
@@ -56,128 +135,210 @@ class NewsRepository:
             return str(url).lower() # Fall back to lowercased string    
     
     @staticmethod
-    async def find_by_normalized_url(url):
+    def _encode_cursor(pit_id: str, sort_values: list) -> str:
         """
-        Find an article by its normalized URL.
-        
+        Build an opaque pagination cursor from a point-in-time id and the sort values of the last hit.
+        """
+        payload = json.dumps({"pit": pit_id, "after": sort_values}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def _decode_cursor(cursor: str):
+        """
+        Decode a cursor produced by _encode_cursor.
+
+        Returns:
+            Tuple of (pit_id, sort_values)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            pit_id = payload["pit"]
+            sort_values = payload["after"]
+        except Exception as e:
+            raise ValueError(f"Invalid cursor: {e}")
+
+        if not isinstance(pit_id, str) or not isinstance(sort_values, list):
+            raise ValueError("Invalid cursor")
+        return pit_id, sort_values
+
+    @staticmethod
+    def _tag_variants(tags: list[str]) -> list[str]:
+        """
+        Tags are exact-match keyword fields and the scraper stores them lowercased,
+        so match both the configured spelling and its lowercase form.
+        """
+        variants = set(tags)
+        variants.update(tag.lower() for tag in tags)
+        return sorted(variants)
+
+    @staticmethod
+    def _filter_clauses(keywords: list[str] = None, industry: str = None) -> list[dict]:
+        """
+        Build non-scoring filter clauses for keyword and industry constraints.
+
         Args:
-            url: The URL to search for (will be normalized)
-            
+            keywords: Articles must be tagged with at least one of these
+            industry: Articles must be in this industry category or tagged with one of its keywords
+
         Returns:
-            Article object if found, None otherwise
+            Clauses for a bool query's filter context
         """
-        if not url:
-            return None
-            
-        normalized_url = NewsRepository._normalize_url(url)
-        if not normalized_url:
-            return None
-            
-        es = get_elasticsearch()
-        
-        # Search for the normalized URL
-        search_query = {
-            "query": {
-                "term": {
-                    "normalized_url": normalized_url
+        filters = []
+        if keywords:
+            filters.append({"terms": {"tags": NewsRepository._tag_variants(keywords)}})
+
+        if industry:
+            # The scraper stores the industry in categories and its keywords in tags
+            filters.append({
+                "bool": {
+                    "should": [
+                        {"term": {"categories": industry}},
+                        {"terms": {"tags": NewsRepository._tag_variants(INDUSTRY_CATEGORIES.get(industry, []))}}
+                    ],
+                    "minimum_should_match": 1
+                }
+            })
+        return filters
+
+    @staticmethod
+    def _text_query(query: str) -> dict:
+        """
+        Build the scoring clause for free text.
+
+        Matches against search_text (title, summary and content copied into
+        one field) plus title on its own, so a title hit scores on top of the
+        combined-field score. Keyword fields such as url or author are never
+        searched.
+
+        With SEARCH_QUERY_MODE "simple" the text is parsed by
+        simple_query_string, limited to SIMPLE_QUERY_FLAGS; with "text" it is
+        matched as plain words. Check it with query_guard first.
+
+        Args:
+            query: Free text entered by the user
+
+        Returns:
+            A simple_query_string or multi_match clause over SEARCH_TEXT_FIELDS
+        """
+        fields = [field.strip() for field in settings.SEARCH_TEXT_FIELDS.split(",") if field.strip()]
+        if settings.SEARCH_QUERY_MODE == "simple":
+            return {
+                "simple_query_string": {
+                    "query": query,
+                    "fields": fields,
+                    "flags": SIMPLE_QUERY_FLAGS,
+                    "default_operator": "or"
                 }
             }
-        }
-        
-        try:
-            response = await es.search(
-                index=settings.NEWS_INDEX,
-                body=search_query,
-                size=1
-            )
-            
-            hits = response.get("hits", {}).get("hits", [])
-            if not hits:
-                return None
-                
-            # Return the first matching article
-            hit = hits[0]
-            source = hit["_source"]
-            
-            return NewsArticle(
-                id=hit["_id"],
-                title=source["title"],
-                content=source["content"],
-                summary=source.get("summary"),
-                author=source.get("author"),
-                source=source.get("source"),
-                published_date=source.get("published_date"),
-                categories=source.get("categories", []),
-                tags=source.get("tags", []),
-                url=source.get("url"),
-                created_at=source.get("created_at"),
-                updated_at=source.get("updated_at")
-            )
-        except Exception as e:
-            logger.error(f"Error searching for article by URL '{normalized_url}': {e}")
-            return None
-    
+        return {"multi_match": {"query": query, "fields": fields, "type": "most_fields"}}
+
     @staticmethod
-    async def search(query: str, keywords: list[str] = None, page: int = 1, limit: int = 100, sort_by: str = "published_date", sort_order: str = "desc"):
-        es = get_elasticsearch()
-        
-        # Calculate from based on page and limit
-        from_idx = (page - 1) * limit
-        
-        # Get current time for recency calculations
-        current_time = datetime.utcnow().isoformat()
-        
-        # Initialize the bool query
-        bool_query = {
-            "must": []
-        }
-        
-        # Build a combined search query from the text query and keywords
+    def _build_search_query(
+        query: str,
+        keywords: list[str] = None,
+        limit: int = 100,
+        sort_by: str = "published_date",
+        sort_order: str = "desc",
+        view: str = "full",
+        facets: list[str] = None,
+        industry: str = None
+    ) -> dict:
+        """
+        Build the Elasticsearch request body for a search, without pagination.
+
+        Only the free-text query is scored. Keyword and industry constraints go
+        into the bool filter context, where Elasticsearch can cache them and
+        skip scoring.
+
+        Without free text (browsing by date) nothing is scored, so _score is
+        left out of the sort and the hit count is only tracked up to
+        SEARCH_TRACK_TOTAL_HITS. A newest-first browse then matches the index
+        sort and Lucene stops reading segments once it has a page of hits.
+        """
         combined_query = query.strip() if query else ""
-        
-        
         logger.info(f"Combined query: {combined_query}")
-        print(f"Combined query: {query}")
-        print(f"Combined query: {keywords}")
-        print(f"Combined query: {combined_query}")
 
-        if query.strip() != "":
-            query_string = query
+        bool_query = {"filter": NewsRepository._filter_clauses(keywords, industry)}
+        if combined_query != "":
+            bool_query["must"] = [NewsRepository._text_query(combined_query)]
+
+        sort = [
+            {"published_date": {"order": sort_order}},
+            # Always include date sort as secondary criterion
+            {sort_by if sort_by != "published_date" else "created_at": {"order": sort_order}}
+        ]
+        search_query = {"query": {"bool": bool_query}, "size": limit}
+        if combined_query != "":
+            search_query["sort"] = [{"_score": {"order": "desc"}}] + sort
         else:
-            query_string = " ".join(keywords)
+            search_query["sort"] = sort
+            if limit > 0:
+                search_query["track_total_hits"] = settings.SEARCH_TRACK_TOTAL_HITS
 
-        # Build the complete search query with function score to boost recent articles
-        search_query = {
-            "query": {
-                "query_string": {
-                    "query": query_string
+        if view == "compact":
+            search_query["_source"] = {"includes": COMPACT_SOURCE_FIELDS}
+            search_query["highlight"] = {
+                "pre_tags": ["<em>"],
+                "post_tags": ["</em>"],
+                "fields": {
+                    "content": {
+                        "fragment_size": settings.SEARCH_SNIPPET_LENGTH,
+                        "number_of_fragments": 1,
+                        # The query targets search_text, so match its terms in content by value
+                        "require_field_match": False,
+                        # Fall back to the start of the body when nothing matched in it
+                        "no_match_size": settings.SEARCH_SNIPPET_LENGTH
+                    }
                 }
-            },
-            "sort": [
-                # If no specific query, prioritize date over score
-                {"_score": {"order": "desc"}},
-                {"published_date": {"order": sort_order}},
-                # Always include date sort as secondary criterion
-                {sort_by if sort_by != "published_date" else "created_at": {"order": sort_order}}
-            ],
-            "from": from_idx,
-            "size": limit
+            }
+
+        if facets:
+            search_query["aggs"] = {
+                facet: {"terms": {"field": FACET_FIELDS[facet][0], "size": FACET_FIELDS[facet][1]}}
+                for facet in facets
+            }
+
+        return search_query
+
+    @staticmethod
+    def _facets_from_response(response: dict, facets: list[str] = None) -> dict:
+        """
+        Convert terms aggregations to {facet: [{"name", "count"}]}.
+        """
+        aggregations = response.get("aggregations", {})
+        return {
+            facet: [
+                {"name": bucket["key"], "count": bucket["doc_count"]}
+                for bucket in aggregations.get(facet, {}).get("buckets", [])
+            ]
+            for facet in facets or []
         }
-        
-        # Execute the search
-        response = await es.search(
-            index=settings.NEWS_INDEX,
-            body=search_query
-        )
-        
-        # Process and return results
-        total = response["hits"]["total"]["value"]
-        hits = response["hits"]["hits"]
-        
+
+    @staticmethod
+    def _hits_to_articles(hits: list, view: str = "full", raw: bool = False) -> list:
+        """
+        Convert search hits to articles in the shape requested by view/raw.
+
+        Compact hits are always returned as dicts: they only carry
+        COMPACT_SOURCE_FIELDS, which no article model describes.
+        """
+        compact = view == "compact"
         articles = []
         for hit in hits:
             source = hit["_source"]
-            article = NewsArticle(
+            if raw or compact:
+                # Trusted path: hand the stored document through without model validation
+                document = {"id": hit["_id"], **source}
+                if compact:
+                    snippets = hit.get("highlight", {}).get("content")
+                    document["snippet"] = snippets[0] if snippets else None
+                articles.append(document)
+                continue
+
+            articles.append(NewsArticle(
                 id=hit["_id"],
                 title=source["title"],
                 content=source["content"],
@@ -190,27 +351,375 @@ class NewsRepository:
                 url=source.get("url"),
                 created_at=source.get("created_at"),
                 updated_at=source.get("updated_at")
-            )
-            articles.append(article)
+            ))
+        return articles
+
+    @staticmethod
+    async def _coalesced_search(es, index: str, body: dict, **params):
+        """
+        Run es.search, joining an identical search that is already in flight.
+        """
+        key = (index, json.dumps(body, sort_keys=True, default=str), tuple(sorted(params.items())))
+        return await search_flight.do(key, lambda: es.search(index=index, body=body, **params))
+
+    @staticmethod
+    async def search(
+        query: str,
+        keywords: list[str] = None,
+        page: int = 1,
+        limit: int = 100,
+        sort_by: str = "published_date",
+        sort_order: str = "desc",
+        cursor: str = None,
+        view: str = "full",
+        raw: bool = False,
+        facets: list[str] = None,
+        industry: str = None
+    ):
+        """
+        Search articles with either offset (page) or cursor pagination.
+
+        query is scored free text; keywords (tags) and industry are applied as
+        filters. With no query, matching articles are filtered only.
+
+        Passing cursor="*" starts a cursor session on a new point in time;
+        passing a next_cursor from a previous response continues it with
+        search_after. Without a cursor, page/limit offset pagination is used.
+
+        With view="compact" only COMPACT_SOURCE_FIELDS are fetched and a
+        highlighted content snippet is returned, as dicts of those fields plus
+        "id" and "snippet".
+
+        With raw=True the articles are the stored _source dicts (plus "id" and,
+        for the compact view, "snippet") instead of validated models, for
+        callers that serialize them directly.
+
+        facets adds terms aggregations (see FACET_FIELDS) to the same request;
+        their buckets are returned under "facets". With limit=0 only the total
+        and facets are computed, and the shard request cache is used.
+        """
+        es = get_elasticsearch()
+        search_query = NewsRepository._build_search_query(
+            query, keywords, limit, sort_by, sort_order, view, facets, industry
+        )
+
+        if cursor:
+            # Cursor mode: search a point in time and continue after the last hit.
+            # The PIT search adds an implicit _shard_doc tiebreaker to the sort.
+            if cursor == "*":
+                pit = await es.open_point_in_time(
+                    index=read_index(),
+                    keep_alive=settings.SEARCH_CURSOR_KEEP_ALIVE
+                )
+                pit_id = pit["id"]
+                search_after = None
+            else:
+                pit_id, search_after = NewsRepository._decode_cursor(cursor)
+
+            search_query["pit"] = {"id": pit_id, "keep_alive": settings.SEARCH_CURSOR_KEEP_ALIVE}
+            if search_after:
+                search_query["search_after"] = search_after
+
+            try:
+                # Searches against a PIT must not name an index
+                response = await es.search(body=search_query)
+            except BaseException as e:
+                if cursor == "*":
+                    # Nobody can continue from this point in time; don't hold it until it expires
+                    await NewsRepository._close_pit(es, pit_id)
+                elif isinstance(e, NotFoundError) or (
+                    isinstance(e, BadRequestError) and NewsRepository._is_pit_error(e)
+                ):
+                    # The PIT outlived SEARCH_CURSOR_KEEP_ALIVE or the cursor was tampered with
+                    raise ValueError("Cursor has expired or is invalid; start again with cursor=*") from e
+                if isinstance(e, BadRequestError):
+                    # Any other rejected request, e.g. sorting on an unmapped field
+                    raise ValueError(NewsRepository._error_reason(e)) from e
+                raise
+        else:
+            # Calculate from based on page and limit
+            search_query["from"] = (page - 1) * limit
+            
+            # Size-0 requests are eligible for the shard request cache
+            params = {"request_cache": True} if limit == 0 else {}
+
+            # Execute the search, sharing the call with identical concurrent searches
+            response = await NewsRepository._coalesced_search(es, read_index(), search_query, **params)
         
-        return {
-            "total": total,
+        # Process and return results
+        hits = response["hits"]["hits"]
+        result = {
+            "total": response["hits"]["total"]["value"],
             "page": page,
             "limit": limit,
-            "articles": articles
+            "articles": NewsRepository._hits_to_articles(hits, view, raw)
         }
+        if response["hits"]["total"].get("relation") == "gte":
+            # Counting stopped at SEARCH_TRACK_TOTAL_HITS; total is a lower bound
+            result["total_relation"] = "gte"
+        if facets:
+            result["facets"] = NewsRepository._facets_from_response(response, facets)
+
+        if cursor:
+            # The PIT id can change between requests; always hand back the latest one
+            pit_id = response.get("pit_id", pit_id)
+            if hits and len(hits) == limit:
+                result["next_cursor"] = NewsRepository._encode_cursor(pit_id, hits[-1]["sort"])
+            else:
+                # Last page reached, release the point in time early
+                result["next_cursor"] = None
+                await NewsRepository._close_pit(es, pit_id)
+
+        return result
+
+    @staticmethod
+    def _is_pit_error(error: Exception) -> bool:
+        """Check whether a 400 from a continuation page is about its point in time id."""
+        return bool(PIT_ERROR.search(f"{error} {getattr(error, 'body', '')}"))
+
+    @staticmethod
+    def _error_reason(error: Exception) -> str:
+        """The most specific reason Elasticsearch gave for rejecting a request."""
+        body = getattr(error, "body", None)
+        details = body.get("error") if isinstance(body, dict) else None
+        if isinstance(details, dict):
+            root_causes = details.get("root_cause") or [details]
+            if root_causes[0].get("reason"):
+                return root_causes[0]["reason"]
+        return str(error)
+
+    @staticmethod
+    async def _close_pit(es, pit_id: str) -> None:
+        """Release a point in time, logging instead of raising on failure."""
+        try:
+            await es.close_point_in_time(id=pit_id)
+        except Exception as e:
+            logger.warning(f"Error closing point in time: {e}")
+
+    @staticmethod
+    async def multi_search(searches: list[dict], raw: bool = False) -> list[dict]:
+        """
+        Run several offset-paged searches in one _msearch round trip.
+
+        Args:
+            searches: Dicts with the keyword arguments of search() (query,
+                keywords, page, limit, sort_by, sort_order, view, facets, industry)
+            raw: Return stored documents instead of models, as in search()
+
+        Returns:
+            One result per search, in input order. Failed searches return
+            {"error": message} instead of failing the whole batch.
+        """
+        if not searches:
+            return []
+
+        es = get_elasticsearch()
+        request = []
+        for spec in searches:
+            page = spec.get("page", 1)
+            limit = spec.get("limit", 100)
+            body = NewsRepository._build_search_query(
+                spec.get("query", ""),
+                spec.get("keywords"),
+                limit,
+                spec.get("sort_by", "published_date"),
+                spec.get("sort_order", "desc"),
+                spec.get("view", "full"),
+                spec.get("facets"),
+                spec.get("industry")
+            )
+            body["from"] = (page - 1) * limit
+            header = {"index": read_index()}
+            if limit == 0:
+                header["request_cache"] = True
+            request.append(header)
+            request.append(body)
+
+        response = await es.msearch(searches=request)
+
+        results = []
+        for spec, item in zip(searches, response["responses"]):
+            if "error" in item:
+                error = item["error"]
+                reason = error.get("reason", error.get("type")) if isinstance(error, dict) else str(error)
+                results.append({"error": reason, "status": item.get("status", 500)})
+                continue
+
+            result = {
+                "total": item["hits"]["total"]["value"],
+                "page": spec.get("page", 1),
+                "limit": spec.get("limit", 100),
+                "articles": NewsRepository._hits_to_articles(item["hits"]["hits"], spec.get("view", "full"), raw)
+            }
+            if item["hits"]["total"].get("relation") == "gte":
+                result["total_relation"] = "gte"
+            if spec.get("facets"):
+                result["facets"] = NewsRepository._facets_from_response(item, spec["facets"])
+            results.append(result)
+        return results
     
     @staticmethod
-    async def get_by_id(article_id: str):
+    async def iter_articles(
+        query: str = None,
+        industry: str = None,
+        from_date: datetime = None,
+        to_date: datetime = None,
+        batch_size: int = None
+    ):
+        """
+        Iterate over every article matching the filters.
+
+        Pages through a point in time with search_after in _shard_doc order,
+        so memory use is bounded by batch_size regardless of how many
+        articles match.
+
+        Args:
+            query: Optional free text to match
+            industry: Industry category to filter on
+            from_date: Only include articles published on or after this date
+            to_date: Only include articles published before this date
+            batch_size: Number of hits fetched per round trip
+
+        Yields:
+            The article source dicts, with the document id under "id"
+        """
+        es = get_elasticsearch()
+        batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+
+        bool_query = {"filter": []}
+        if query and query.strip():
+            bool_query["must"] = [NewsRepository._text_query(query.strip())]
+
+        if from_date or to_date:
+            date_range = {}
+            if from_date:
+                date_range["gte"] = from_date.isoformat()
+            if to_date:
+                date_range["lt"] = to_date.isoformat()
+            bool_query["filter"].append({"range": {"published_date": date_range}})
+
+        bool_query["filter"].extend(NewsRepository._filter_clauses(industry=industry))
+
+        pit = await es.open_point_in_time(
+            index=read_index(),
+            keep_alive=settings.SEARCH_CURSOR_KEEP_ALIVE
+        )
+        pit_id = pit["id"]
+
+        try:
+            search_after = None
+            while True:
+                search_query = {
+                    "query": {"bool": bool_query},
+                    "pit": {"id": pit_id, "keep_alive": settings.SEARCH_CURSOR_KEEP_ALIVE},
+                    "sort": ["_shard_doc"],
+                    "size": batch_size,
+                    "track_total_hits": False
+                }
+                if search_after:
+                    search_query["search_after"] = search_after
+
+                # Pre-filter every shard so partitions whose published dates lie
+                # outside the window are skipped before the query phase
+                response = await es.search(
+                    body=search_query,
+                    pre_filter_shard_size=1 if from_date or to_date else None
+                )
+                pit_id = response.get("pit_id", pit_id)
+                hits = response["hits"]["hits"]
+
+                for hit in hits:
+                    yield {"id": hit["_id"], **hit["_source"]}
+
+                if len(hits) < batch_size:
+                    break
+                search_after = hits[-1]["sort"]
+        finally:
+            await NewsRepository._close_pit(es, pit_id)
+
+    @staticmethod
+    async def suggest_titles(prefix: str, size: int = 5) -> list[dict]:
+        """
+        Suggest article titles starting with a prefix using the title.suggest completion field.
+
+        Returns:
+            List of {"id", "title"} dicts
+        """
+        es = get_elasticsearch()
+        response = await es.search(
+            index=read_index(),
+            body={
+                "_source": ["title"],
+                "suggest": {
+                    "title_suggest": {
+                        "prefix": prefix,
+                        "completion": {
+                            "field": "title.suggest",
+                            "size": size,
+                            "skip_duplicates": True
+                        }
+                    }
+                }
+            }
+        )
+
+        options = response.get("suggest", {}).get("title_suggest", [{}])[0].get("options", [])
+        return [
+            {"id": option["_id"], "title": option.get("_source", {}).get("title", option.get("text"))}
+            for option in options
+        ]
+
+    @staticmethod
+    async def reload_search_analyzers() -> list[dict]:
+        """
+        Reload the search analyzers of every news index, picking up edits to
+        the synonyms file (NEWS_SYNONYMS_PATH) on the nodes.
+
+        Returns:
+            One {"index", "reloaded_analyzers", "reloaded_node_ids"} entry per index
+        """
+        es = get_elasticsearch()
+        response = await es.indices.reload_search_analyzers(index=read_index())
+        # Cached results were computed with the old synonyms
+        search_cache.invalidate()
+        return response.get("reload_details", [])
+
+    @staticmethod
+    async def get_by_id(article_id: str, raw: bool = False):
+        """
+        Fetch one article.
+
+        Args:
+            article_id: ID of the article
+            raw: Return the source dict (with "id", "_seq_no" and "_primary_term")
+                instead of a NewsArticle model
+
+        Returns:
+            The article, or None if it doesn't exist
+        """
         es = get_elasticsearch()
         
         try:
-            response = await es.get(
-                index=settings.NEWS_INDEX,
-                id=article_id
-            )
+            if is_partitioned():
+                # The article may be in any monthly partition; look it up by id behind the read alias
+                hits = await NewsRepository._find_by_ids([article_id], seq_no_primary_term=True)
+                if article_id not in hits:
+                    return None
+                response = hits[article_id]
+            else:
+                response = await es.get(
+                    index=settings.NEWS_INDEX,
+                    id=article_id
+                )
             
             source = response["_source"]
+            if raw:
+                return {
+                    "id": response["_id"],
+                    **source,
+                    "_seq_no": response.get("_seq_no"),
+                    "_primary_term": response.get("_primary_term")
+                }
             return NewsArticle(
                 id=response["_id"],
                 title=source["title"],
@@ -227,106 +736,269 @@ class NewsRepository:
             )
         except NotFoundError:
             return None
+
+    @staticmethod
+    async def get_many(article_ids: list[str], raw: bool = False) -> list:
+        """
+        Fetch several articles in one multi-get request.
+
+        Args:
+            article_ids: IDs to fetch; duplicates are fetched once
+            raw: Return source dicts (with "id") instead of NewsArticle models
+
+        Returns:
+            One entry per input id, in input order; None for ids that don't exist
+        """
+        es = get_elasticsearch()
+        unique_ids = list(dict.fromkeys(article_ids))
+        if is_partitioned():
+            docs = (await NewsRepository._find_by_ids(unique_ids)).values()
+        else:
+            response = await es.mget(index=settings.NEWS_INDEX, ids=unique_ids)
+            docs = [doc for doc in response["docs"] if doc.get("found")]
+
+        found = {}
+        for doc in docs:
+            document = {"id": doc["_id"], **doc["_source"]}
+            found[doc["_id"]] = document if raw else NewsArticle(**document)
+
+        return [found.get(article_id) for article_id in article_ids]
     
     @staticmethod
-    async def create(article: NewsArticleCreate):
+    def _make_serializable(article_dict: dict) -> dict:
+        """
+        Convert dates, URLs and other non-JSON values in an article dict in place.
+        """
+        # Handle potential JSON serialization issues with dates
+        if "published_date" in article_dict and article_dict["published_date"] is not None:
+            if isinstance(article_dict["published_date"], datetime):
+                article_dict["published_date"] = article_dict["published_date"].isoformat()
+            elif not isinstance(article_dict["published_date"], str):
+                article_dict["published_date"] = str(article_dict["published_date"])
+        
+        # Make URL serializable (Pydantic HttpUrl might cause issues)
+        if "url" in article_dict and article_dict["url"] is not None:
+            article_dict["url"] = str(article_dict["url"])
+        
+        # Ensure all fields are properly serializable
+        for key in list(article_dict.keys()):
+            value = article_dict[key]
+            if value is None:
+                continue  # None is JSON serializable
+            elif isinstance(value, (list, dict)):
+                # Check nested items in lists
+                if isinstance(value, list):
+                    article_dict[key] = [str(item) if not isinstance(item, (str, int, float, bool, type(None))) else item for item in value]
+            elif not isinstance(value, (str, int, float, bool)):
+                # Convert other non-serializable types to string
+                article_dict[key] = str(value)
+        return article_dict
+
+    @staticmethod
+    def _article_id(normalized_url: str) -> str:
+        """
+        Derive a deterministic document id from a normalized URL.
+
+        Every write for the same URL targets the same document, so
+        deduplication needs no lookup and cannot race.
+        """
+        return hashlib.blake2b(normalized_url.encode("utf-8"), digest_size=16).hexdigest()
+
+    @staticmethod
+    async def _find_by_ids(article_ids: list[str], source: bool = True, seq_no_primary_term: bool = False) -> dict:
+        """
+        Look articles up by id across every index behind the read alias.
+
+        Unlike get/mget this works on an alias spanning several partitions,
+        but only sees writes that have been refreshed.
+
+        Returns:
+            {id: hit} for the ids that exist
+        """
+        es = get_elasticsearch()
+        found = {}
+        for start in range(0, len(article_ids), ID_LOOKUP_BATCH_SIZE):
+            batch = article_ids[start:start + ID_LOOKUP_BATCH_SIZE]
+            response = await es.search(
+                index=read_index(),
+                body={
+                    "query": {"ids": {"values": batch}},
+                    "size": len(batch),
+                    "_source": source,
+                    "seq_no_primary_term": seq_no_primary_term
+                }
+            )
+            for hit in response["hits"]["hits"]:
+                found[hit["_id"]] = hit
+        return found
+
+    @staticmethod
+    async def _index_of(article_id: str):
+        """
+        Concrete index holding an article, or None if it doesn't exist (partitioned mode).
+
+        Without partitioning every article is in NEWS_INDEX, and a missing
+        article surfaces as NotFoundError from the write itself.
+        """
+        if not is_partitioned():
+            return settings.NEWS_INDEX
+        hit = (await NewsRepository._find_by_ids([article_id], source=False)).get(article_id)
+        return hit["_index"] if hit else None
+
+    @staticmethod
+    async def _route_actions(actions: list[dict]) -> None:
+        """
+        Fill in _index for bulk actions that don't name one.
+
+        Actions on articles that already exist go to the partition holding
+        them (one lookup for the whole batch), everything else to the write
+        index. An article therefore stays in the partition of the month it
+        was first ingested in, whatever its published_date.
+        """
+        unrouted = [action for action in actions if not action.get("_index")]
+        if not unrouted:
+            return
+
+        located = {}
+        if is_partitioned():
+            ids = list(dict.fromkeys(action["_id"] for action in unrouted if action.get("_id")))
+            if ids:
+                hits = await NewsRepository._find_by_ids(ids, source=False)
+                located = {article_id: hit["_index"] for article_id, hit in hits.items()}
+
+        target = await write_index()
+        for action in unrouted:
+            action["_index"] = located.get(action.get("_id"), target)
+
+    @staticmethod
+    def _prepare_document(article: NewsArticleCreate) -> dict:
+        """
+        Turn an article into a serializable document, adding normalized_url when it has a URL.
+        """
+        # Handle Pydantic v2 vs v1 differences
+        try:
+            # Pydantic v2 way
+            article_dict = article.model_dump(exclude_unset=True)
+        except AttributeError:
+            # Fallback to Pydantic v1 way
+            article_dict = article.dict(exclude_unset=True)
+
+        url = article_dict.get("url")
+        if url:
+            # Keep the original URL and store the normalized one for deduplication
+            article_dict["url"] = str(url)
+            article_dict["normalized_url"] = NewsRepository._normalize_url(url)
+
+        return NewsRepository._make_serializable(article_dict)
+
+    @staticmethod
+    def _upsert_script(document: dict, now: str) -> dict:
+        """
+        Script that creates the article or merges it into the existing one.
+        """
+        return {
+            "source": UPSERT_SCRIPT,
+            "lang": "painless",
+            "params": {"doc": document, "now": now}
+        }
+
+    @staticmethod
+    def _upsert_action(article_dict: dict, now: str, index: str = None) -> dict:
+        """
+        Bulk action that writes one prepared article the same way create() does.
+
+        Every action carries an _id (a new one for articles without a URL), so
+        bulk responses can be matched back to it. Without an index the action
+        is routed by _route_actions before it is sent.
+        """
+        normalized_url = article_dict.get("normalized_url")
+        if normalized_url:
+            return {
+                "_op_type": "update",
+                "_index": index,
+                "_id": NewsRepository._article_id(normalized_url),
+                "script": NewsRepository._upsert_script(article_dict, now),
+                "upsert": {},
+                "scripted_upsert": True,
+                "retry_on_conflict": 3
+            }
+
+        article_dict["created_at"] = now
+        article_dict["updated_at"] = now
+        return {"_op_type": "index", "_index": index, "_id": uuid.uuid4().hex, "_source": article_dict}
+
+    @staticmethod
+    async def create(article: NewsArticleCreate, write_policy: str = "immediate"):
+        """
+        Create an article, or merge it into the existing article with the same URL.
+
+        New articles go to the write index (with partitioning, the current
+        month's partition through the write alias); an existing article is
+        merged in the partition that holds it.
+
+        Args:
+            article: Article to write
+            write_policy: "immediate" refreshes the index before returning,
+                "wait_for" returns once the write is visible to search, and
+                "async" queues the write in the write-behind buffer and returns
+                the article as sent (tags are not merged with a stored duplicate)
+
+        Returns:
+            The stored article
+        """
         es = get_elasticsearch()
         
         try:
             now = datetime.utcnow().isoformat()
-            
-            # Handle Pydantic v2 vs v1 differences
-            try:
-                # Pydantic v2 way
-                article_dict = article.model_dump(exclude_unset=True)
-            except AttributeError:
-                # Fallback to Pydantic v1 way
-                article_dict = article.dict(exclude_unset=True)
-            
-            # Check for duplicate by URL if URL exists
-            url = article_dict.get("url")
-            existing_article = None
-            
-            if url:
-                # Normalize the URL for deduplication - removing query params and fragments
-                normalized_url = NewsRepository._normalize_url(url)
-                
-                # Store both original and normalized URLs in the document
-                article_dict["url"] = str(url)  # Keep the original URL
-                article_dict["normalized_url"] = normalized_url  # Store normalized for searching
-                
-                # Log the normalization for debugging
-                logger.debug(f"Original URL: {url}")
-                logger.debug(f"Normalized URL: {normalized_url}")
-                
-                # Check if an article with this normalized URL already exists
-                existing_article = await NewsRepository.find_by_normalized_url(url)
-                
-                if existing_article:
+            article_dict = NewsRepository._prepare_document(article)
+            normalized_url = article_dict.get("normalized_url")
+
+            if write_policy == "async":
+                # The write buffer routes the action to its partition when it flushes
+                action = NewsRepository._upsert_action(article_dict, now)
+                await write_buffer.add(action)
+                document = {"created_at": now, "updated_at": now, **article_dict}
+                return NewsArticle(id=action["_id"], **document)
+
+            refresh = refresh_for_policy(write_policy)
+
+            if normalized_url:
+                # One idempotent scripted upsert keyed by the URL hash: creates the
+                # article, or merges tags into the existing one keeping created_at
+                article_id = NewsRepository._article_id(normalized_url)
+                # Merge into the partition already holding the URL, if any
+                index = await NewsRepository._index_of(article_id) or await write_index()
+                response = await es.update(
+                    index=index,
+                    id=article_id,
+                    script=NewsRepository._upsert_script(article_dict, now),
+                    upsert={},
+                    scripted_upsert=True,
+                    retry_on_conflict=3,
+                    source=True,
+                    refresh=refresh
+                )
+                search_cache.invalidate()
+                article_cache.discard(article_id)
+
+                if response.get("result") == "updated":
                     logger.info(f"Found duplicate article with URL: {normalized_url}")
-                    
-                    # Update the existing article instead of creating a new one
-                    # Extract the ID of the existing article
-                    article_id = existing_article.id
-                    
-                    # Keep the original created_at date
-                    article_dict["created_at"] = existing_article.created_at
-                    article_dict["updated_at"] = now
-                    
-                    # Merge tags from both articles to avoid losing information
-                    if "tags" in article_dict and existing_article.tags:
-                        combined_tags = list(set(article_dict["tags"] + existing_article.tags))
-                        article_dict["tags"] = combined_tags
-                    
-                    # Update the existing article
-                    await es.update(
-                        index=settings.NEWS_INDEX,
-                        id=article_id,
-                        doc=article_dict,
-                        refresh=True
-                    )
-                    
-                    # Return the updated article
-                    return await NewsRepository.get_by_id(article_id)
-            
-            # If no duplicate was found or no URL was provided, create a new article
+
+                return NewsArticle(id=article_id, **response["get"]["_source"])
             
-            # Ensure dates are properly formatted as strings
+            # No URL to deduplicate on, index a new article with a generated id
             article_dict["created_at"] = now
             article_dict["updated_at"] = now
             
-            # Handle potential JSON serialization issues with dates
-            if "published_date" in article_dict and article_dict["published_date"] is not None:
-                if isinstance(article_dict["published_date"], datetime):
-                    article_dict["published_date"] = article_dict["published_date"].isoformat()
-                elif not isinstance(article_dict["published_date"], str):
-                    article_dict["published_date"] = str(article_dict["published_date"])
-            
-            # Make URL serializable (Pydantic HttpUrl might cause issues)
-            if "url" in article_dict and article_dict["url"] is not None:
-                article_dict["url"] = str(article_dict["url"])
-            
-            # Ensure all fields are properly serializable
-            for key in list(article_dict.keys()):
-                value = article_dict[key]
-                if value is None:
-                    continue  # None is JSON serializable
-                elif isinstance(value, (list, dict)):
-                    # Check nested items in lists
-                    if isinstance(value, list):
-                        article_dict[key] = [str(item) if not isinstance(item, (str, int, float, bool, type(None))) else item for item in value]
-                elif not isinstance(value, (str, int, float, bool)):
-                    # Convert other non-serializable types to string
-                    article_dict[key] = str(value)
-            
             # Log sanitized data for debugging
             logging.debug(f"Sanitized article data: {article_dict}")
             
             response = await es.index(
-                index=settings.NEWS_INDEX,
+                index=await write_index(),
                 document=article_dict,
-                refresh=True
+                refresh=refresh
             )
+            search_cache.invalidate()
             
             return NewsArticle(
                 id=response["_id"],
@@ -336,17 +1008,120 @@ class NewsRepository:
             logging.error(f"Error creating article in Elasticsearch: {e}")
             logging.error(f"Article data: {article}")
             raise
-    
+
     @staticmethod
-    async def update(article_id: str, article: NewsArticleUpdate):
+    async def bulk_upsert(
+        articles: list[NewsArticleCreate],
+        chunk_size: int = None,
+        refresh: bool = False
+    ) -> list[dict]:
+        """
+        Create or update many articles with the bulk API.
+
+        Articles with a URL use the same deterministic id and scripted upsert
+        as create(), so duplicates (including within the batch) merge into one
+        document. With partitioning, one id lookup for the whole batch finds
+        the partitions of articles that already exist. No refresh is forced
+        per document.
+
+        Args:
+            articles: Articles to ingest
+            chunk_size: Documents per bulk request (defaults to settings.BULK_CHUNK_SIZE)
+            refresh: Refresh the index once after the whole batch
+
+        Returns:
+            One result per input article, in input order, with "id" and
+            "result" ("created", "updated", "noop" or "error") and "error" on failure
+        """
+        es = get_elasticsearch()
+        chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+        now = datetime.utcnow().isoformat()
+
+        actions = [
+            NewsRepository._upsert_action(NewsRepository._prepare_document(article), now)
+            for article in articles
+        ]
+        await NewsRepository._route_actions(actions)
+
+        # Items that were retried after a 429 come back after the rest of their
+        # chunk, so match responses to input positions by id rather than by arrival.
+        # Positions of a URL repeated in the batch are filled in order.
+        positions = {}
+        for position, action in enumerate(actions):
+            positions.setdefault(action["_id"], deque()).append(position)
+
+        results = [None] * len(actions)
+        async for ok, item in async_streaming_bulk(
+            es,
+            actions,
+            chunk_size=chunk_size,
+            raise_on_error=False,
+            raise_on_exception=False,
+            max_retries=settings.BULK_MAX_RETRIES
+        ):
+            info = next(iter(item.values()))
+            pending = positions.get(info.get("_id"))
+            if not pending:
+                logger.warning(f"Bulk response for unexpected id: {info.get('_id')}")
+                continue
+            position = pending.popleft()
+            if ok:
+                results[position] = {"id": info["_id"], "result": info.get("result", "created")}
+            else:
+                error = info.get("error")
+                reason = error.get("reason", error.get("type")) if isinstance(error, dict) else str(error)
+                results[position] = {"id": info["_id"], "result": "error", "error": reason}
+
+        for position, action in enumerate(actions):
+            if results[position] is None:
+                results[position] = {"id": action["_id"], "result": "error", "error": "No response from bulk request"}
+
+        if refresh:
+            await es.indices.refresh(index=read_index())
+        search_cache.invalidate()
+        for action in actions:
+            article_cache.discard(action["_id"])
+
+        return results
+
+    @staticmethod
+    async def update(
+        article_id: str,
+        article: NewsArticleUpdate,
+        write_policy: str = "immediate",
+        if_seq_no: int = None,
+        if_primary_term: int = None,
+        raw: bool = False
+    ):
+        """
+        Apply a partial update to an article in one round trip.
+
+        The update request returns the new source, so the article is built from
+        its response without reading it before or after. Updates that change
+        no field are no-ops: updated_at and the document version stay as they are.
+
+        Args:
+            article_id: ID of the article to update
+            article: Fields to change
+            write_policy: Refresh policy; with "async" the update is queued in the
+                write-behind buffer and the existing article merged with the
+                changes is returned. Conditional updates are never queued: they
+                are sent right away, without a refresh, so a conflict can be reported
+            if_seq_no: Only apply the update if the article is at this sequence number
+            if_primary_term: Primary term that goes with if_seq_no
+            raw: Return the source dict (with "id" and the new "_seq_no" and
+                "_primary_term"; both None for a queued update) instead of a
+                NewsArticle model
+
+        Returns:
+            The updated article, or None if it doesn't exist
+
+        Raises:
+            ConflictError: The article changed since if_seq_no/if_primary_term
+        """
         es = get_elasticsearch()
         
         try:
-            # Get the existing article
-            existing = await NewsRepository.get_by_id(article_id)
-            if not existing:
-                return None
-            
             # Handle Pydantic v2 vs v1 differences
             try:
                 # Pydantic v2 way
@@ -355,8 +1130,7 @@ class NewsRepository:
                 # Fallback to Pydantic v1 way
                 update_data = article.dict(exclude_unset=True)
             
-            # Update the timestamp
-            update_data["updated_at"] = datetime.utcnow().isoformat()
+            now = datetime.utcnow().isoformat()
             
             # If URL is being updated, update the normalized URL as well
             if "url" in update_data and update_data["url"] is not None:
@@ -376,30 +1150,92 @@ class NewsRepository:
                 elif not isinstance(value, (str, int, float, bool)):
                     update_data[key] = str(value)
             
-            # Update in Elasticsearch
-            await es.update(
-                index=settings.NEWS_INDEX,
+            script = {
+                "source": UPDATE_SCRIPT,
+                "lang": "painless",
+                "params": {"doc": update_data, "now": now}
+            }
+
+            conditional = if_seq_no is not None and if_primary_term is not None
+            if write_policy == "async" and not conditional:
+                # The buffered write returns nothing, so read the article to answer now
+                existing = await NewsRepository.get_by_id(article_id, raw)
+                if not existing:
+                    return None
+                await write_buffer.add({
+                    "_op_type": "update",
+                    "_id": article_id,
+                    "script": script
+                })
+                if raw:
+                    # The version is only known once the buffer has been flushed
+                    return {**existing, **update_data, "updated_at": now, "_seq_no": None, "_primary_term": None}
+                return NewsArticle(**{**existing.model_dump(), **update_data, "updated_at": now})
+
+            params = {}
+            if conditional:
+                params = {"if_seq_no": if_seq_no, "if_primary_term": if_primary_term}
+
+            index = await NewsRepository._index_of(article_id)
+            if index is None:
+                return None
+
+            # Update in Elasticsearch and get the new source back in the same call.
+            # The article stays in its partition even if published_date changes,
+            # since partitions follow the ingest month.
+            response = await es.update(
+                index=index,
                 id=article_id,
-                doc=update_data,
-                refresh=True
+                script=script,
+                source=True,
+                refresh=False if write_policy == "async" else refresh_for_policy(write_policy),
+                **params
             )
-            
-            # Return the updated article
-            return await NewsRepository.get_by_id(article_id)
+            if response.get("result") != "noop":
+                search_cache.invalidate()
+                article_cache.discard(article_id)
+
+            if raw:
+                return {
+                    "id": article_id,
+                    **response["get"]["_source"],
+                    "_seq_no": response.get("_seq_no"),
+                    "_primary_term": response.get("_primary_term")
+                }
+            return NewsArticle(id=article_id, **response["get"]["_source"])
+        except NotFoundError:
+            return None
+        except ConflictError:
+            raise
         except Exception as e:
             logging.error(f"Error updating article in Elasticsearch: {e}")
             raise
     
     @staticmethod
-    async def delete(article_id: str):
+    async def delete(article_id: str, write_policy: str = "immediate"):
+        """
+        Delete an article.
+
+        With the async write policy the delete is queued in the write-behind
+        buffer and reported as successful without checking that the article exists.
+        """
         es = get_elasticsearch()
+
+        if write_policy == "async":
+            await write_buffer.add({"_op_type": "delete", "_id": article_id})
+            return True
         
         try:
+            index = await NewsRepository._index_of(article_id)
+            if index is None:
+                return False
             await es.delete(
-                index=settings.NEWS_INDEX,
+                index=index,
                 id=article_id,
-                refresh=True
+                refresh=refresh_for_policy(write_policy)
             )
+            search_cache.invalidate()
+            article_cache.discard(article_id)
             return True
         except NotFoundError:
             return False
\ No newline at end of file
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from elasticsearch.helpers import async_streaming_bulk
+
+from app.db.elasticsearch import get_elasticsearch
+from app.core.background import create_background_task
+from app.core.cache import article_cache, search_cache
+
+logger = logging.getLogger(__name__)
+
+WRITE_POLICIES = ("immediate", "wait_for", "async")
+
+
+def refresh_for_policy(policy: str):
+    """
+    Map a synchronous write policy to the Elasticsearch refresh parameter.
+
+    immediate forces a refresh (a new segment per write); wait_for returns once
+    the next scheduled refresh has made the write visible.
+    """
+    if policy == "immediate":
+        return True
+    if policy == "wait_for":
+        return "wait_for"
+    raise ValueError(f"Invalid write policy '{policy}'. Expected one of {WRITE_POLICIES}")
+
+
+class WriteBufferFullError(Exception):
+    """Raised instead of queueing a write while the buffer holds max_pending actions."""
+
+    def __init__(self, pending: int):
+        super().__init__(f"Write buffer is full ({pending} writes pending); retry later")
+
+
+class WriteBehindBuffer:
+    """
+    Buffer of bulk actions flushed to Elasticsearch by size or time.
+
+    Used by the async write policy: writes are acknowledged once queued and
+    become searchable after the next flush and index refresh. A flush is
+    triggered when max_actions are pending or every flush_interval seconds.
+
+    prepare, if given, is awaited with each batch before it is sent, e.g. to
+    route actions to their index.
+
+    Actions that could not be sent stay queued for the next flush. While the
+    cluster is unreachable at most max_pending actions are held; further
+    writes are refused with WriteBufferFullError.
+    """
+
+    def __init__(
+        self,
+        max_actions: int = 500,
+        flush_interval: float = 5.0,
+        max_retries: int = 2,
+        prepare: Optional[Callable[[List[Dict[str, Any]]], Awaitable[None]]] = None,
+        max_pending: int = 10000
+    ):
+        self.max_actions = max_actions
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.prepare = prepare
+        self.max_pending = max_pending
+        self._pending: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        # One flush at a time, so close() waits for a flush already under way
+        self._flush_lock = asyncio.Lock()
+        self.flushes = 0
+        self.flushed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    async def add(self, action: Dict[str, Any]) -> None:
+        """
+        Queue a bulk action, flushing right away once max_actions are pending.
+
+        Raises:
+            WriteBufferFullError: If max_pending actions are already queued
+        """
+        if len(self._pending) >= self.max_pending:
+            self.rejected += 1
+            raise WriteBufferFullError(len(self._pending))
+
+        self._pending.append(action)
+        if self._task is None or self._task.done():
+            self._task = create_background_task(self._run())
+        if len(self._pending) >= self.max_actions:
+            try:
+                await self.flush()
+            except Exception as e:
+                # The write is queued either way; the next flush retries it
+                logger.error(f"Error flushing write buffer: {e}")
+
+    async def flush(self) -> int:
+        """
+        Send every pending action in bulk requests.
+
+        Returns:
+            Number of actions that failed
+        """
+        async with self._flush_lock:
+            return await self._flush()
+
+    async def _flush(self) -> int:
+        if not self._pending:
+            return 0
+
+        # Swap the buffer before awaiting so writes queued during the flush go to the next one
+        actions, self._pending = self._pending, []
+        failures = 0
+        try:
+            if self.prepare is not None:
+                await self.prepare(actions)
+            async for ok, item in async_streaming_bulk(
+                get_elasticsearch(),
+                actions,
+                chunk_size=self.max_actions,
+                raise_on_error=False,
+                raise_on_exception=False,
+                max_retries=self.max_retries
+            ):
+                if not ok:
+                    failures += 1
+                    logger.error(f"Buffered write failed: {item}")
+        except BaseException:
+            # Cluster unreachable, circuit open or flush cancelled: keep the writes for the
+            # next flush. Replaying a partly sent batch is harmless, as every action has an id.
+            self._pending = actions + self._pending
+            raise
+
+        self.flushes += 1
+        self.flushed += len(actions) - failures
+        self.failed += failures
+        search_cache.invalidate()
+        for action in actions:
+            if "_id" in action:
+                article_cache.discard(action["_id"])
+        logger.debug(f"Flushed {len(actions)} buffered writes ({failures} failed)")
+        return failures
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing write buffer: {e}")
+
+    async def close(self) -> None:
+        """Stop the periodic flush and send whatever is still pending."""
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            # A flush cancelled midway has requeued its actions once the task is done
+            await asyncio.gather(task, return_exceptions=True)
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "max_pending": self.max_pending,
+            "flushes": self.flushes,
+            "flushed": self.flushed,
+            "failed": self.failed,
+            "rejected": self.rejected
+        }
@@ -25,6 +25,9 @@ class NewsArticleBase(BaseModel):
 class NewsArticleCreate(NewsArticleBase):
     pass
 
+class NewsArticleBulkCreate(BaseModel):
+    articles: List[NewsArticleCreate] = Field(..., min_length=1)
+
 class NewsArticleUpdate(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None
@@ -50,4 +53,22 @@ class NewsArticle(NewsArticleBase):
     updated_at: datetime
 
     class Config:
-        from_attributes = True  # In Pydantic v2, orm_mode was renamed to from_attributes
\ No newline at end of file
+        from_attributes = True  # In Pydantic v2, orm_mode was renamed to from_attributes
+
+class NewsSearchRequest(BaseModel):
+    """One search in a batch; mirrors the /api/news/search query parameters."""
+    q: str = ""
+    keyword: Optional[str] = None
+    industry: Optional[str] = None
+    page: int = Field(1, ge=1)
+    limit: int = Field(10, ge=0, le=100)
+    sort_by: str = "published_date"
+    sort_order: str = "desc"
+    view: str = Field("full", pattern="^(full|compact)$")
+    facets: Optional[List[str]] = None
+
+class NewsSearchBatchRequest(BaseModel):
+    searches: List[NewsSearchRequest] = Field(..., min_length=1, max_length=50)
+
+class NewsBatchGetRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=500)
@@ -16,6 +16,25 @@ import random
 from app.models.news import NewsArticle
 from app.core.constants import INDUSTRY_IMAGES
 
+# Response fields and their defaults, in NewsArticleResponse field order
+_FULL_FIELDS = (
+    ("title", None), ("content", None), ("summary", None), ("author", None),
+    ("source", None), ("published_date", None), ("categories", []), ("tags", []),
+    ("url", None), ("created_at", None), ("updated_at", None)
+)
+_COMPACT_FIELDS = (
+    ("title", None), ("summary", None), ("source", None),
+    ("published_date", None), ("snippet", None)
+)
+
+def _payload_from_document(document: dict, fields: tuple, image_url: Optional[str]) -> dict:
+    payload = {"id": document["id"]}
+    for field, default in fields:
+        value = document.get(field)
+        payload[field] = default if value is None and default is not None else value
+    payload["image_url"] = image_url
+    return payload
+
 class NewsArticleResponse(BaseModel):
     id: str
     title: str
@@ -42,6 +61,17 @@ class NewsArticleResponse(BaseModel):
         article_dict['image_url'] = image_url
         
         return cls(**article_dict)
+
+    @classmethod
+    def payload_from_document(cls, document: dict, keywords: List[str]) -> dict:
+        """
+        Build the JSON payload for a stored document without model validation.
+
+        The document comes straight from Elasticsearch (see NewsRepository.search
+        with raw=True), so its values are already JSON types; dates and URLs are
+        passed through as stored instead of being parsed and re-serialized.
+        """
+        return _payload_from_document(document, _FULL_FIELDS, cls._select_image_url(keywords))
     
     @staticmethod
     def _select_image_url(keywords: List[str]) -> Optional[str]:
@@ -79,5 +109,19 @@ class NewsArticleResponse(BaseModel):
         # No matching category found
         return None
 
+class NewsArticleCompactResponse(BaseModel):
+    id: str
+    title: str
+    summary: Optional[str] = None
+    source: Optional[str] = None
+    published_date: Optional[datetime] = None
+    snippet: Optional[str] = None
+    image_url: Optional[str] = None
+
+    @classmethod
+    def payload_from_document(cls, document: dict, keywords: List[str]) -> dict:
+        """Build the compact JSON payload for a stored document without model validation."""
+        return _payload_from_document(document, _COMPACT_FIELDS, NewsArticleResponse._select_image_url(keywords))
+
 # 3. Update the routes in app/api/routes.py
 # Add the necessary import and update the route handlers
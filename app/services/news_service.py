@@ -1,8 +1,11 @@
-from app.db.news_repository import NewsRepository
+from app.db.news_repository import NewsRepository, write_buffer
 from app.models.news import NewsArticle, NewsArticleCreate, NewsArticleUpdate
 from app.services.summarizer_service import SummarizerService
 from app.core.config import settings
-from typing import Dict, List, Optional
+from app.core.query_guard import QueryRejectedError, query_guard
+from app.core.serialization import dumps_json
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,16 +18,122 @@ class NewsService:
         page: int = 1, 
         limit: int = 100,
         sort_by: str = "published_date",
-        sort_order: str = "desc"
+        sort_order: str = "desc",
+        cursor: str = None,
+        view: str = "full",
+        raw: bool = False,
+        facets: List[str] = None,
+        industry: str = None
     ) -> Dict:
-        return await NewsRepository.search(query, keywords,  page, limit, sort_by, sort_order)
+        # Raises QueryRejectedError (a ValueError) before anything reaches the cluster
+        query = query_guard.check(query)
+        return await NewsRepository.search(query, keywords,  page, limit, sort_by, sort_order, cursor, view, raw, facets, industry)
+
+    @staticmethod
+    async def multi_search_news(searches: List[Dict], raw: bool = False) -> List[Dict]:
+        """
+        Run several searches in one round trip. A query rejected by the
+        query guard yields an error entry and is not sent.
+        """
+        results: List[Optional[Dict]] = [None] * len(searches)
+        accepted = []
+        for position, spec in enumerate(searches):
+            try:
+                accepted.append((position, {**spec, "query": query_guard.check(spec.get("query", ""))}))
+            except QueryRejectedError as e:
+                results[position] = {"error": str(e), "status": 400}
+
+        found = await NewsRepository.multi_search([spec for _, spec in accepted], raw)
+        for (position, _), result in zip(accepted, found):
+            results[position] = result
+        return results
+
+    @staticmethod
+    def search_cache_key(
+        query: str,
+        keyword: Optional[str] = None,
+        industry: Optional[str] = None,
+        page: int = 1,
+        limit: int = 100,
+        sort_by: str = "published_date",
+        sort_order: str = "desc",
+        view: str = "full",
+        facets: List[str] = None
+    ) -> tuple:
+        """
+        Build the search cache key for a request.
+
+        Whitespace in the query is collapsed; case is kept so that queries
+        are only shared when the text is identical.
+        """
+        return (
+            "search",
+            " ".join((query or "").split()),
+            keyword or "",
+            industry or "",
+            page,
+            limit,
+            sort_by,
+            sort_order.lower(),
+            view,
+            tuple(sorted(facets or []))
+        )
     
     @staticmethod
-    async def get_news_by_id(article_id: str) -> Optional[NewsArticle]:
-        return await NewsRepository.get_by_id(article_id)
+    def export_news(
+        query: str = None,
+        industry: str = None,
+        from_date: datetime = None,
+        to_date: datetime = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream every matching article as newline-delimited JSON.
+
+        The query is checked right away, so a rejected query fails before
+        the response starts streaming.
+        """
+        return NewsService._export_stream(query_guard.check(query), industry, from_date, to_date)
+
+    @staticmethod
+    async def _export_stream(
+        query: str,
+        industry: str,
+        from_date: datetime,
+        to_date: datetime
+    ) -> AsyncIterator[bytes]:
+        async for article in NewsRepository.iter_articles(
+            query=query,
+            industry=industry,
+            from_date=from_date,
+            to_date=to_date
+        ):
+            yield dumps_json(article) + b"\n"
+
+    @staticmethod
+    async def suggest_titles(prefix: str, size: int = 5) -> List[Dict]:
+        return await NewsRepository.suggest_titles(prefix, size)
+
+    @staticmethod
+    async def reload_synonyms() -> List[Dict]:
+        return await NewsRepository.reload_search_analyzers()
+
+    @staticmethod
+    async def get_news_by_id(article_id: str, raw: bool = False) -> Optional[NewsArticle]:
+        return await NewsRepository.get_by_id(article_id, raw)
+    
+    @staticmethod
+    async def get_news_by_ids(article_ids: List[str], raw: bool = False) -> List[Optional[NewsArticle]]:
+        return await NewsRepository.get_many(article_ids, raw)
     
     @staticmethod
-    async def create_news(article: NewsArticleCreate) -> NewsArticle:
+    async def create_news(article: NewsArticleCreate, write_policy: str = None) -> NewsArticle:
+        """
+        Create an article, auto-generating its summary when enabled.
+
+        Args:
+            article: Article to create
+            write_policy: Refresh policy for the write (defaults to settings.WRITE_POLICY_CREATE)
+        """
         # Auto-generate summary if enabled and not already provided
         if settings.ENABLE_AUTO_SUMMARIZATION and not article.summary:
             try:
@@ -57,15 +166,48 @@ class NewsService:
             except Exception as e:
                 logger.error(f"Failed to auto-generate summary: {e}")
         
-        return await NewsRepository.create(article)
+        return await NewsRepository.create(article, write_policy or settings.WRITE_POLICY_CREATE)
+    
+    @staticmethod
+    async def bulk_create_news(
+        articles: List[NewsArticleCreate],
+        chunk_size: int = None,
+        refresh: bool = False
+    ) -> Dict:
+        """
+        Ingest many articles through the bulk API.
+
+        Auto-summarization is skipped here; one summarizer call per article
+        would defeat the point of bulk ingestion. Use summarize_article
+        afterwards for articles that need a summary.
+        """
+        results = await NewsRepository.bulk_upsert(articles, chunk_size, refresh)
+        return {
+            "total": len(results),
+            "created": sum(1 for result in results if result["result"] == "created"),
+            "updated": sum(1 for result in results if result["result"] == "updated"),
+            "errors": sum(1 for result in results if result["result"] == "error"),
+            "items": results
+        }
     
     @staticmethod
-    async def update_news(article_id: str, article: NewsArticleUpdate) -> Optional[NewsArticle]:
+    async def update_news(
+        article_id: str,
+        article: NewsArticleUpdate,
+        write_policy: str = None,
+        if_seq_no: int = None,
+        if_primary_term: int = None,
+        raw: bool = False
+    ) -> Optional[NewsArticle]:
+        """
+        Update an article, regenerating its summary when the content changes.
+
+        The stored article is only read when the new content is empty and the
+        update has no title to summarize instead; otherwise the update is a
+        single Elasticsearch call.
+        """
         # Auto-generate summary if enabled, content is updated, and summary not provided
         try:
-            # Check if we need to update the summary
-            update_summary = False
-            
             # Handle both Pydantic v1 and v2
             try:
                 # Pydantic v2
@@ -79,46 +221,59 @@ class NewsService:
                 'content' in article_dict and 
                 'summary' not in article_dict):
                 
-                update_summary = True
+                # Check if content is available or use title as fallback
+                text_to_summarize = article_dict['content']
+                if not text_to_summarize or text_to_summarize == "No content available":
+                    # Use the updated title if available, otherwise use existing title
+                    if 'title' in article_dict and article_dict['title']:
+                        text_to_summarize = article_dict['title']
+                    else:
+                        existing_article = await NewsRepository.get_by_id(article_id)
+                        text_to_summarize = existing_article.title if existing_article else None
+                    logger.info(f"Using title for summarization as content is not available: {text_to_summarize}")
                 
-            if update_summary:
-                existing_article = await NewsRepository.get_by_id(article_id)
-                if existing_article:
-                    # Check if content is available or use title as fallback
-                    text_to_summarize = article_dict['content']
-                    if not text_to_summarize or text_to_summarize == "No content available":
-                        # Use the updated title if available, otherwise use existing title
-                        if 'title' in article_dict and article_dict['title']:
-                            text_to_summarize = article_dict['title']
-                        else:
-                            text_to_summarize = existing_article.title
-                        logger.info(f"Using title for summarization as content is not available: {text_to_summarize}")
-                    
-                    if text_to_summarize:
-                        summary = await SummarizerService.summarize_text(
-                            text_to_summarize,
-                            max_length=settings.SUMMARY_MAX_LENGTH
-                        )
-                        if summary:
-                            article_dict['summary'] = summary
-                            
-                            # Update the article object
-                            try:
-                                # Pydantic v2
-                                article = NewsArticleUpdate(**article_dict)
-                            except TypeError:
-                                # Pydantic v1
-                                article = NewsArticleUpdate.parse_obj(article_dict)
-                            
-                            logger.info(f"Auto-generated summary for updated article: {existing_article.title}")
+                if text_to_summarize:
+                    summary = await SummarizerService.summarize_text(
+                        text_to_summarize,
+                        max_length=settings.SUMMARY_MAX_LENGTH
+                    )
+                    if summary:
+                        article_dict['summary'] = summary
+                        
+                        # Update the article object
+                        try:
+                            # Pydantic v2
+                            article = NewsArticleUpdate(**article_dict)
+                        except TypeError:
+                            # Pydantic v1
+                            article = NewsArticleUpdate.parse_obj(article_dict)
+                        
+                        logger.info(f"Auto-generated summary for updated article: {article_id}")
         except Exception as e:
             logger.error(f"Failed to auto-generate summary during update: {e}")
         
-        return await NewsRepository.update(article_id, article)
+        return await NewsRepository.update(
+            article_id,
+            article,
+            write_policy or settings.WRITE_POLICY_UPDATE,
+            if_seq_no=if_seq_no,
+            if_primary_term=if_primary_term,
+            raw=raw
+        )
+    
+    @staticmethod
+    async def flush_writes() -> int:
+        """
+        Send writes queued with the async write policy now.
+
+        Returns:
+            Number of queued writes that failed
+        """
+        return await write_buffer.flush()
     
     @staticmethod
-    async def delete_news(article_id: str) -> bool:
-        return await NewsRepository.delete(article_id)
+    async def delete_news(article_id: str, write_policy: str = None) -> bool:
+        return await NewsRepository.delete(article_id, write_policy or settings.WRITE_POLICY_DELETE)
         
     @staticmethod
     async def summarize_article(article_id: str, max_length: int = None) -> Optional[str]:
@@ -160,7 +315,7 @@ class NewsService:
             
         # Update the article with the new summary
         update = NewsArticleUpdate(summary=summary)
-        updated_article = await NewsRepository.update(article_id, update)
+        updated_article = await NewsRepository.update(article_id, update, settings.WRITE_POLICY_UPDATE)
         
         if updated_article:
             logger.info(f"Updated article with new summary: {article_id}")
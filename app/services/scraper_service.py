@@ -272,7 +272,7 @@ class ScraperService:
                 # Create article using the NewsService
                 try:
                     article_create = NewsArticleCreate(**article_data)
-                    await NewsService.create_news(article_create)
+                    await NewsService.create_news(article_create, settings.WRITE_POLICY_SCRAPER)
                     articles_stored += 1
                     logger.info(f"Article stored successfully: {article_data['title']}")
                 except Exception as e:
@@ -348,6 +348,9 @@ class ScraperService:
             # Sleep between requests to avoid rate limiting
             await asyncio.sleep(random.uniform(3, 5))
         
+        # Articles are written behind a buffer; make this run's articles searchable now
+        await NewsService.flush_writes()
+        
         logger.info(f"Scraping complete. Total articles stored: {total_articles}")
         return total_articles
     
@@ -481,7 +484,7 @@ class ScraperService:
                 # Create article using the NewsService
                 try:
                     article_create = NewsArticleCreate(**article_data)
-                    await NewsService.create_news(article_create)
+                    await NewsService.create_news(article_create, settings.WRITE_POLICY_SCRAPER)
                     articles_stored += 1
                     logger.info(f"Article stored successfully: {article_data['title']}")
                 except Exception as e:
@@ -6,6 +6,7 @@ from app.db.elasticsearch import init_elasticsearch, create_index_if_not_exists
 from app.core.nltk_init import download_nltk_resources
 from app.core.background import create_background_task
 from app.services.scraper_service import ScraperService
+from app.db.news_repository import write_buffer
 from app.db.dynamodb import init_dynamodb, create_user_subscriptions_table_if_not_exists
 from app.services.event_service import EventService  # Import EventService
 
@@ -33,6 +34,12 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    # Send writes still queued by the async write policy
+    try:
+        await write_buffer.close()
+    except Exception as e:
+        logger.error(f"Error flushing queued writes on shutdown ({write_buffer.stats()['pending']} pending): {e}")
+    
     # Shutdown the EventService
     await EventService.shutdown()
     logger.info("EventService shutdown completed")
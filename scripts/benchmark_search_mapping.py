@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark mapping a page of Elasticsearch hits to the /api/news/search payload.
+
+Compares the validated model path (hit -> NewsArticle -> NewsArticleResponse ->
+response validation -> JSON) with the trusted path used by the search route
+(hit -> payload dict -> JSON).
+
+Usage:
+    python scripts/benchmark_search_mapping.py [--hits 100] [--rounds 200]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+# Ensure the app directory is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from app.models.news import NewsArticle
+from app.models.responses.news import NewsArticleResponse
+
+KEYWORDS = ["dairy", "GST", "Food & Agro Processing"]
+
+def make_hits(count: int) -> list:
+    content = "Indian dairy exports rose sharply this quarter. " * 400  # ~20KB body
+    return [
+        {
+            "_id": f"article-{i}",
+            "_source": {
+                "title": f"Dairy exports rise {i}",
+                "content": content,
+                "summary": "Dairy exports rose sharply this quarter.",
+                "author": "Staff Reporter",
+                "source": "example.com",
+                "published_date": "2024-03-01T10:15:00",
+                "categories": ["Food & Agro Processing"],
+                "tags": ["dairy", "gst"],
+                "url": f"https://example.com/news/dairy-exports-{i}",
+                "normalized_url": f"https://example.com/news/dairy-exports-{i}",
+                "created_at": "2024-03-01T10:20:00.123456",
+                "updated_at": "2024-03-01T10:20:00.123456"
+            }
+        }
+        for i in range(count)
+    ]
+
+def validated_path(hits: list) -> bytes:
+    articles = []
+    for hit in hits:
+        source = hit["_source"]
+        articles.append(NewsArticle(
+            id=hit["_id"],
+            title=source["title"],
+            content=source["content"],
+            summary=source.get("summary"),
+            author=source.get("author"),
+            source=source.get("source"),
+            published_date=source.get("published_date"),
+            categories=source.get("categories", []),
+            tags=source.get("tags", []),
+            url=source.get("url"),
+            created_at=source.get("created_at"),
+            updated_at=source.get("updated_at")
+        ))
+    responses = [NewsArticleResponse.from_article(article, KEYWORDS) for article in articles]
+    # FastAPI validates and encodes the returned models once more
+    responses = [NewsArticleResponse.model_validate(response.model_dump()) for response in responses]
+    payload = {"total": len(hits), "page": 1, "limit": len(hits), "articles": responses}
+    return json.dumps(jsonable_encoder(payload)).encode("utf-8")
+
+def trusted_path(hits: list) -> bytes:
+    articles = [
+        NewsArticleResponse.payload_from_document({"id": hit["_id"], **hit["_source"]}, KEYWORDS)
+        for hit in hits
+    ]
+    payload = {"total": len(hits), "page": 1, "limit": len(hits), "articles": articles}
+    return json.dumps(payload).encode("utf-8")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hits", type=int, default=100, help="Hits per page")
+    parser.add_argument("--rounds", type=int, default=200, help="Pages mapped per measurement")
+    args = parser.parse_args()
+
+    hits = make_hits(args.hits)
+    results = {}
+    for name, func in (("validated", validated_path), ("trusted", trusted_path)):
+        best = min(timeit.repeat(lambda: func(hits), number=args.rounds, repeat=5))
+        results[name] = best / args.rounds * 1000
+        print(f"{name:>10}: {results[name]:.3f} ms per {args.hits}-hit page")
+
+    print(f"   speedup: {results['validated'] / results['trusted']:.1f}x")
+
+if __name__ == "__main__":
+    main()
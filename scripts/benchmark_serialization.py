@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark encoding a /api/news/search page with the default JSONResponse
+(jsonable_encoder + json.dumps) against FastJSONResponse.
+
+Usage:
+    python scripts/benchmark_serialization.py [--hits 100] [--rounds 200]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+# Ensure the app directory is in the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.core import serialization
+from app.core.serialization import FastJSONResponse
+from app.models.responses.news import NewsArticleResponse
+from scripts.benchmark_search_mapping import KEYWORDS, make_hits
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hits", type=int, default=100, help="Hits per page")
+    parser.add_argument("--rounds", type=int, default=200, help="Pages encoded per measurement")
+    args = parser.parse_args()
+
+    hits = make_hits(args.hits)
+    page = {
+        "total": args.hits,
+        "page": 1,
+        "limit": args.hits,
+        "articles": [
+            NewsArticleResponse.payload_from_document({"id": hit["_id"], **hit["_source"]}, KEYWORDS)
+            for hit in hits
+        ]
+    }
+    # Same page as validated models, the shape the other article routes return
+    model_page = dict(page, articles=[NewsArticleResponse.model_validate(a) for a in page["articles"]])
+
+    print(f"JSON backend: {'orjson' if serialization.orjson else 'json (orjson not installed)'}")
+    cases = (
+        ("default, dicts", lambda: JSONResponse(jsonable_encoder(page))),
+        ("fast, dicts", lambda: FastJSONResponse(page)),
+        ("default, models", lambda: JSONResponse(jsonable_encoder(model_page))),
+        ("fast, models", lambda: FastJSONResponse(model_page)),
+    )
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=args.rounds, repeat=5))
+        print(f"{name:>16}: {best / args.rounds * 1000:.3f} ms per {args.hits}-hit page")
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,7 @@ logger = logging.getLogger("data-populator")
 from app.core.config import settings
 from app.db.elasticsearch import init_elasticsearch, create_index_if_not_exists
 from app.core.nltk_init import download_nltk_resources
+from app.db.news_repository import write_buffer
 from app.services.scraper_service import ScraperService
 
 async def main():
@@ -38,7 +39,7 @@ async def main():
         
         # Create index if it doesn't exist
         await create_index_if_not_exists()
-        logger.info(f"Ensured Elasticsearch index '{settings.NEWS_INDEX}' exists")
+        logger.info(f"Ensured Elasticsearch index '{settings.NEWS_INDEX}' exists (partitioning: {settings.NEWS_INDEX_PARTITIONING})")
         
         # Download NLTK resources for the scraper
         download_nltk_resources()
@@ -59,6 +60,12 @@ async def main():
     except Exception as e:
         logger.error(f"Error in data populator service: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        # WRITE_POLICY_SCRAPER=async queues articles; send the rest before exiting
+        try:
+            await write_buffer.close()
+        except Exception as e:
+            logger.error(f"Error flushing queued writes on exit ({write_buffer.stats()['pending']} pending): {e}")
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+"""
+Zero-downtime reindex into the current mapping.
+
+For each news index (every partition behind the read alias, or NEWS_INDEX
+without partitioning) this script:
+
+1. creates a versioned copy ("<name>-v<N>") with the mapping and settings
+   from app.db.elasticsearch.news_index_body(), with replicas and refresh
+   disabled while it is filled,
+2. copies the documents with a sliced, throttled _reindex task and reports
+   its progress,
+3. catches up with documents written during the copy (by updated_at) until
+   few remain, then blocks writes on the source for a last pass,
+4. deletes from the copy every document no longer in the source, so
+   articles deleted during the copy stay deleted,
+5. moves articles stored under legacy random ids to the id derived from
+   their normalized URL, which is the only id the API writes to,
+6. atomically moves the read/write aliases to the copy, gives it the old
+   name as an alias and removes the old index.
+
+Articles stay reachable under the same name, so the API and the data
+populator keep working throughout. Only articles with legacy ids change id;
+if the URL already has a document under its derived id, that newer copy is
+kept and the legacy one is dropped.
+
+Usage:
+    python scripts/reindex.py [--index news-2024.03] [--slices auto] [--requests-per-second 500]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+
+from elasticsearch.helpers import async_bulk, async_scan
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.db.elasticsearch import init_elasticsearch, is_partitioned, news_index_body
+from app.db.news_repository import NewsRepository
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+VERSION_SUFFIX = re.compile(r"^(?P<name>.+)-v(?P<version>\d+)$")
+
+def next_version(name: str, current: str) -> str:
+    """
+    Name of the next versioned index for a logical index name.
+
+    The original, unversioned index counts as version 1.
+    """
+    match = VERSION_SUFFIX.match(current)
+    version = int(match.group("version")) + 1 if match and match.group("name") == name else 2
+    return f"{name}-v{version}"
+
+def swap_actions(name: str, current: str, target: str, aliases: dict) -> list:
+    """
+    update_aliases actions that replace current with target in one step.
+
+    Args:
+        name: Logical index name clients use (becomes an alias of target)
+        current: Concrete index now holding the data
+        target: Concrete index that replaces it
+        aliases: Aliases of current, as returned by indices.get_alias
+    """
+    actions = []
+    for alias, options in aliases.items():
+        if alias == name:
+            continue
+        add = {"index": target, "alias": alias}
+        if options.get("is_write_index"):
+            add["is_write_index"] = True
+        actions.append({"add": add})
+    actions.append({"add": {"index": target, "alias": name}})
+    # Removing the old index in the same call frees its name and drops its aliases atomically
+    actions.append({"remove_index": {"index": current}})
+    return actions
+
+async def run_reindex(es, source: str, target: str, args, query: dict = None) -> dict:
+    """
+    Run one _reindex task from source to target and log its progress.
+
+    Returns:
+        The final task status
+    """
+    source_spec = {"index": source, "size": args.batch_size}
+    if query:
+        source_spec["query"] = query
+
+    response = await es.reindex(
+        source=source_spec,
+        dest={"index": target},
+        slices=args.slices if args.slices == "auto" else int(args.slices),
+        requests_per_second=args.requests_per_second,
+        wait_for_completion=False
+    )
+    task_id = response["task"]
+
+    while True:
+        task = await es.tasks.get(task_id=task_id)
+        status = task["task"]["status"]
+        copied = status.get("created", 0) + status.get("updated", 0)
+        total = status.get("total", 0)
+        percent = copied / total * 100 if total else 100.0
+        logger.info(f"{source} -> {target}: {copied}/{total} documents ({percent:.1f}%)")
+
+        if task.get("completed"):
+            failures = task.get("response", {}).get("failures") or []
+            if task.get("error") or failures:
+                raise RuntimeError(f"Reindex {source} -> {target} failed: {task.get('error') or failures[:3]}")
+            return status
+
+        await asyncio.sleep(args.poll_seconds)
+
+async def delete_missing(es, source: str, target: str, args) -> int:
+    """
+    Delete documents from target that no longer exist in source.
+
+    Catch-up passes select by updated_at and cannot see deletes, so the
+    ids of the copy are checked against the source in batches.
+
+    Returns:
+        Number of documents deleted from target
+    """
+    deleted = 0
+    batch = []
+
+    async def flush():
+        nonlocal deleted
+        # mget is realtime, so deletes not yet refreshed on the source count too
+        response = await es.mget(index=source, ids=batch, source=False)
+        missing = [doc["_id"] for doc in response["docs"] if not doc.get("found")]
+        if missing:
+            await async_bulk(es, (
+                {"_op_type": "delete", "_index": target, "_id": article_id} for article_id in missing
+            ))
+            deleted += len(missing)
+        batch.clear()
+
+    query = {"query": {"match_all": {}}, "_source": False}
+    async for hit in async_scan(es, index=target, query=query, size=args.batch_size):
+        batch.append(hit["_id"])
+        if len(batch) >= args.batch_size:
+            await flush()
+    if batch:
+        await flush()
+    return deleted
+
+async def rekey_legacy(es, index: str, args) -> tuple:
+    """
+    Move documents with legacy random ids to their normalized-URL id.
+
+    Returns:
+        (moved, dropped): legacy documents moved to their new id, and legacy
+        duplicates dropped because the new id was already taken
+    """
+    actions = []
+    query = {"query": {"exists": {"field": "normalized_url"}}}
+    async for hit in async_scan(es, index=index, query=query, size=args.batch_size):
+        article_id = NewsRepository._article_id(hit["_source"]["normalized_url"])
+        if hit["_id"] == article_id:
+            continue
+        # "create" fails with 409 when the URL was written under its new id already
+        actions.append({"_op_type": "create", "_index": index, "_id": article_id, "_source": hit["_source"]})
+        actions.append({"_op_type": "delete", "_index": index, "_id": hit["_id"]})
+
+    if not actions:
+        return 0, 0
+    _, errors = await async_bulk(es, actions, chunk_size=args.batch_size, raise_on_error=False)
+    dropped = sum(1 for error in errors if error.get("create", {}).get("status") == 409)
+    errors = [error for error in errors if error.get("create", {}).get("status") != 409]
+    if errors:
+        raise RuntimeError(f"Re-keying {index} failed: {errors[:3]}")
+    return len(actions) // 2 - dropped, dropped
+
+async def migrate(es, name: str, args) -> None:
+    """Move one logical index onto a fresh copy with the current mapping."""
+    aliases_by_index = await es.indices.get_alias(index=name)
+    if len(aliases_by_index) != 1:
+        raise RuntimeError(f"{name} resolves to {len(aliases_by_index)} indices; pass a single index")
+    current, info = next(iter(aliases_by_index.items()))
+    target = next_version(name, current)
+
+    body = news_index_body()
+    final_replicas = body["settings"]["number_of_replicas"]
+    final_refresh = body["settings"].get("refresh_interval")
+    body["settings"]["number_of_replicas"] = 0
+    body["settings"]["refresh_interval"] = "-1"
+    await es.indices.create(index=target, body=body)
+    logger.info(f"Created {target} for {name} (currently {current})")
+
+    # Documents written from here on are copied again by the catch-up passes
+    since = datetime.utcnow() - timedelta(seconds=args.skew_seconds)
+    await run_reindex(es, current, target, args)
+
+    blocked = False
+    try:
+        passes = 0
+        final_pass = False
+        while True:
+            passes += 1
+            pass_started = datetime.utcnow() - timedelta(seconds=args.skew_seconds)
+            if final_pass and args.block_writes:
+                # Hold writes for the last short pass so none land after it
+                await es.indices.put_settings(index=current, settings={"index.blocks.write": True})
+                blocked = True
+
+            status = await run_reindex(
+                es, current, target, args,
+                query={"range": {"updated_at": {"gte": since.isoformat()}}}
+            )
+            caught_up = status.get("created", 0) + status.get("updated", 0)
+            logger.info(f"Catch-up pass {passes} copied {caught_up} documents written since {since.isoformat()}")
+            since = pass_started
+
+            if final_pass:
+                break
+            final_pass = caught_up <= args.catch_up_threshold or passes >= args.max_catch_up_passes
+
+        await es.indices.put_settings(index=target, settings={
+            "index": {"number_of_replicas": final_replicas, "refresh_interval": final_refresh}
+        })
+        await es.indices.refresh(index=[current, target])
+
+        deleted = await delete_missing(es, current, target, args)
+        if deleted:
+            logger.info(f"Deleted {deleted} documents from {target} that were deleted from {current} during the copy")
+            await es.indices.refresh(index=target)
+
+        moved, dropped = await rekey_legacy(es, target, args)
+        if moved or dropped:
+            logger.info(f"Moved {moved} documents in {target} to normalized-URL ids; dropped {dropped} legacy duplicates")
+            await es.indices.refresh(index=target)
+
+        source_count = (await es.count(index=current))["count"]
+        target_count = (await es.count(index=target))["count"]
+        if target_count < source_count - dropped:
+            raise RuntimeError(f"{target} has {target_count} documents, {current} has {source_count}")
+
+        await es.indices.update_aliases(actions=swap_actions(name, current, target, info.get("aliases", {})))
+        logger.info(f"Swapped {name} to {target} ({target_count} documents); removed {current}")
+    except Exception:
+        if blocked:
+            await es.indices.put_settings(index=current, settings={"index.blocks.write": None})
+        raise
+
+async def main():
+    parser = argparse.ArgumentParser(description='Reindex news indices into the current mapping without downtime')
+    parser.add_argument('--index', action='append', help='Index or partition to migrate (default: all)')
+    parser.add_argument('--slices', default='auto', help='Parallel slices per reindex task ("auto" or a number)')
+    parser.add_argument('--requests-per-second', type=float, default=500, help='Throttle in documents per second (-1 for none)')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Documents per scroll batch')
+    parser.add_argument('--poll-seconds', type=float, default=5, help='Seconds between progress reports')
+    parser.add_argument('--skew-seconds', type=float, default=60, help='Overlap added to catch-up windows for clock skew')
+    parser.add_argument('--catch-up-threshold', type=int, default=100, help='Documents per pass considered caught up')
+    parser.add_argument('--max-catch-up-passes', type=int, default=5, help='Catch-up passes before the final blocked one')
+    parser.add_argument('--no-block-writes', dest='block_writes', action='store_false',
+                        help='Skip the write block during the final pass (writes in that window can be lost)')
+    args = parser.parse_args()
+
+    es = init_elasticsearch()
+    try:
+        names = args.index
+        if not names:
+            if is_partitioned():
+                indices = await es.indices.get_alias(name=settings.NEWS_READ_ALIAS)
+                # Migrate partitions under their logical names, not their versioned ones
+                names = sorted({
+                    VERSION_SUFFIX.match(index).group("name") if VERSION_SUFFIX.match(index) else index
+                    for index in indices
+                })
+            else:
+                names = [settings.NEWS_INDEX]
+
+        for name in names:
+            await migrate(es, name, args)
+    finally:
+        await es.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,10 @@
+from unittest.mock import AsyncMock, patch
+
 import pytest
 from fastapi.testclient import TestClient
+from app.core.cache import article_cache, search_cache, suggest_cache
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.query_guard import query_guard
 from app.models.news import NewsArticleCreate
 
 def test_health_check(test_client):
@@ -119,4 +124,104 @@ async def test_delete_news(test_client, es_client):
     
     # Try to get the deleted article
     get_response = test_client.get(f"/api/news/{article_id}")
-    assert get_response.status_code == 404
\ No newline at end of file
+    assert get_response.status_code == 404
+
+
+def test_get_news_etag_and_not_modified(test_client):
+    article_cache.clear()
+    document = {
+        "id": "etag-1", "title": "Dairy exports rise", "content": "Content", "tags": ["dairy"],
+        "created_at": "2023-01-01T00:00:00", "updated_at": "2023-01-01T00:00:00",
+        "_seq_no": 12, "_primary_term": 3
+    }
+
+    with patch("app.api.routes.NewsService.get_news_by_id", AsyncMock(return_value=document)) as get_news:
+        first = test_client.get("/api/news/etag-1")
+        second = test_client.get("/api/news/etag-1", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.status_code == 200
+    assert first.headers["ETag"] == '"3-12"'
+    assert first.json()["title"] == "Dairy exports rise"
+    assert second.status_code == 304
+    assert second.content == b""
+    # The second request was served from the article cache
+    assert get_news.await_count == 1
+    article_cache.clear()
+
+
+def test_open_circuit_returns_503(test_client):
+    article_cache.clear()
+    with patch("app.api.routes.NewsService.get_news_by_id", AsyncMock(side_effect=CircuitOpenError("Elasticsearch", 12))):
+        response = test_client.get("/api/news/any-id")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "12"
+
+
+def test_expensive_query_is_rejected_before_search(test_client):
+    rejected = query_guard.rejected
+    with patch("app.db.news_repository.NewsRepository.search", AsyncMock()) as search:
+        response = test_client.get("/api/news/search", params={"q": " | ".join(["term"] * 100)})
+
+    assert response.status_code == 400
+    assert search.await_count == 0
+    assert query_guard.rejected == rejected + 1
+
+
+def test_get_news_does_not_cache_over_concurrent_write(test_client):
+    article_cache.clear()
+    document = {
+        "id": "race-1", "title": "Old title", "content": "Content", "tags": [],
+        "created_at": "2023-01-01T00:00:00", "updated_at": "2023-01-01T00:00:00",
+        "_seq_no": 1, "_primary_term": 1
+    }
+
+    async def read_then_written(article_id, raw=False):
+        # A PUT lands while the read is in flight
+        article_cache.discard(article_id)
+        return document
+
+    with patch("app.api.routes.NewsService.get_news_by_id", side_effect=read_then_written):
+        response = test_client.get("/api/news/race-1")
+
+    assert response.status_code == 200
+    assert article_cache.get("race-1") is None
+
+
+def test_update_rejects_half_a_version_condition(test_client):
+    with patch("app.api.routes.NewsService.update_news", AsyncMock()) as update:
+        response = test_client.put("/api/news/a", params={"if_seq_no": 7}, json={"title": "New"})
+
+    assert response.status_code == 400
+    assert update.await_count == 0
+
+
+def test_update_returns_etag_of_new_version(test_client):
+    document = {
+        "id": "a", "title": "New", "content": "Content", "tags": [],
+        "created_at": "2023-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00",
+        "_seq_no": 9, "_primary_term": 2
+    }
+    with patch("app.api.routes.NewsService.update_news", AsyncMock(return_value=document)) as update:
+        response = test_client.put("/api/news/a", headers={"If-Match": '"2-8"'}, json={"title": "New"})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"2-9"'
+    assert response.json()["title"] == "New"
+    kwargs = update.call_args.kwargs
+    assert (kwargs["if_seq_no"], kwargs["if_primary_term"]) == (8, 2)
+
+
+def test_suggestions_have_their_own_cache(test_client):
+    suggest_cache.clear()
+    suggestions = [{"id": "a", "title": "Dairy exports rise"}]
+    with patch("app.api.routes.NewsService.suggest_titles", AsyncMock(return_value=suggestions)) as suggest:
+        first = test_client.get("/api/news/suggest", params={"prefix": "Dai"})
+        # Writes empty the search cache but leave suggestions to their TTL
+        search_cache.invalidate()
+        second = test_client.get("/api/news/suggest", params={"prefix": "dai"})
+
+    assert first.json() == second.json() == {"suggestions": suggestions}
+    assert suggest.await_count == 1
+    assert suggest_cache.stats()["hits"] == 1
+    suggest_cache.clear()
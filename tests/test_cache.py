@@ -0,0 +1,80 @@
+from unittest.mock import patch
+from app.core.cache import ResponseCache
+
+def test_lru_eviction():
+    cache = ResponseCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    assert cache.get("a") == b"1"  # "a" becomes most recently used
+
+    cache.set("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+    assert cache.stats()["evictions"] == 1
+
+def test_ttl_expiry():
+    cache = ResponseCache(max_entries=10, ttl_seconds=5)
+    with patch("app.core.cache.time.monotonic", return_value=100.0):
+        cache.set("a", b"1")
+    with patch("app.core.cache.time.monotonic", return_value=104.0):
+        assert cache.get("a") == b"1"
+    with patch("app.core.cache.time.monotonic", return_value=106.0):
+        assert cache.get("a") is None
+
+def test_invalidate_bumps_generation():
+    cache = ResponseCache()
+    cache.set("a", b"1")
+    generation = cache.generation
+
+    cache.invalidate()
+
+    assert cache.get("a") is None
+    # A value computed before the write must not be stored
+    cache.set("b", b"2", generation=generation)
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert stats["hits"] == 0
+    assert stats["misses"] == 2
+    assert stats["invalidations"] == 1
+
+def test_disabled_cache():
+    cache = ResponseCache(enabled=False)
+    cache.set("a", b"1")
+    assert cache.get("a") is None
+
+def test_discard_drops_one_entry():
+    cache = ResponseCache()
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+
+    cache.discard("a")
+    cache.discard("missing")
+
+    assert cache.get("a") is None
+    assert cache.get("b") == b"2"
+    assert cache.generation == 0
+
+def test_fill_started_before_discard_is_not_stored():
+    cache = ResponseCache(max_entries=2)
+    before = cache.discard_sequence
+    cache.discard("a")
+
+    cache.set("a", b"old", discard_sequence=before)
+    assert cache.get("a") is None
+
+    # Other keys and fills started after the discard are stored
+    cache.set("b", b"2", discard_sequence=before)
+    cache.set("a", b"new", discard_sequence=cache.discard_sequence)
+    assert cache.get("b") == b"2"
+    assert cache.get("a") == b"new"
+
+def test_forgotten_discards_keep_older_fills_out():
+    cache = ResponseCache(max_entries=1)
+    before = cache.discard_sequence
+    cache.discard("a")
+    cache.discard("b")  # pushes "a" out of the discard log
+
+    cache.set("a", b"old", discard_sequence=before)
+    assert cache.get("a") is None
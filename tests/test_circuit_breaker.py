@@ -0,0 +1,40 @@
+import pytest
+from unittest.mock import patch
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("backend", failure_threshold=2, reset_seconds=30)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.check()
+    assert 0 < error.value.retry_after <= 30
+    assert breaker.stats()["rejected"] == 1
+
+def test_half_open_lets_one_trial_through():
+    breaker = CircuitBreaker("backend", failure_threshold=1, reset_seconds=10)
+
+    with patch("app.core.circuit_breaker.time.monotonic", return_value=100.0):
+        breaker.record_failure()
+    with patch("app.core.circuit_breaker.time.monotonic", return_value=111.0):
+        assert breaker.state == "half_open"
+        assert breaker.allow() is True
+        # Further calls wait while the trial is out
+        assert breaker.allow() is False
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.stats()["opens"] == 1
+
+def test_disabled_breaker_always_allows():
+    breaker = CircuitBreaker("backend", failure_threshold=1, enabled=False)
+    breaker.record_failure()
+    assert breaker.allow() is True
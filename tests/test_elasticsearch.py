@@ -0,0 +1,91 @@
+import pytest
+from datetime import datetime
+from unittest.mock import patch, AsyncMock, MagicMock
+from app.core.config import settings
+from app.db import elasticsearch as es_module
+from app.db.elasticsearch import partition_month
+
+@pytest.fixture(autouse=True)
+def monthly_partitions(monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_INDEX_PARTITIONING", "monthly")
+    monkeypatch.setattr(es_module, "_known_partitions", set())
+
+def test_partition_month_is_ingest_month():
+    assert partition_month(datetime(2023, 12, 31)) == "2023.12"
+    assert partition_month() == datetime.utcnow().strftime("%Y.%m")
+
+@pytest.mark.asyncio
+async def test_write_index_is_write_alias_after_rollover(monkeypatch):
+    rollover = AsyncMock()
+    monkeypatch.setattr(es_module, "rollover_write_alias", rollover)
+
+    assert await es_module.write_index() == settings.NEWS_WRITE_ALIAS
+    rollover.assert_awaited_once()
+
+    # Once this month's partition is known, writes don't touch the aliases
+    es_module._known_partitions.add(f"{settings.NEWS_INDEX}-{partition_month()}")
+    assert await es_module.write_index() == settings.NEWS_WRITE_ALIAS
+    assert rollover.await_count == 1
+
+@pytest.mark.asyncio
+async def test_rollover_moves_write_alias_atomically(monkeypatch):
+    current = f"{settings.NEWS_INDEX}-{partition_month()}"
+    client = MagicMock()
+    client.indices.create = AsyncMock()
+    client.indices.exists_alias = AsyncMock(return_value=True)
+    client.indices.get_alias = AsyncMock(side_effect=lambda name=None, index=None: (
+        {index: {}} if index else {f"{settings.NEWS_INDEX}-2000.01": {}}
+    ))
+    client.indices.update_aliases = AsyncMock()
+    monkeypatch.setattr(es_module, "es_client", client)
+
+    assert await es_module.rollover_write_alias() == current
+
+    create_kwargs = client.indices.create.call_args.kwargs
+    assert create_kwargs["index"] == current
+    assert create_kwargs["body"]["aliases"] == {settings.NEWS_READ_ALIAS: {}}
+    client.indices.update_aliases.assert_awaited_once_with(actions=[
+        {"add": {"index": current, "alias": settings.NEWS_WRITE_ALIAS, "is_write_index": True}},
+        {"remove": {"index": f"{settings.NEWS_INDEX}-2000.01", "alias": settings.NEWS_WRITE_ALIAS}}
+    ])
+
+@pytest.mark.asyncio
+async def test_rollover_after_reindex_targets_versioned_index(monkeypatch):
+    current = f"{settings.NEWS_INDEX}-{partition_month()}"
+    migrated = f"{current}-v2"
+    es_module._known_partitions.add(current)
+    client = MagicMock()
+    client.indices.exists_alias = AsyncMock(return_value=True)
+    # scripts/reindex.py left the partition name as an alias of the versioned copy
+    client.indices.get_alias = AsyncMock(side_effect=lambda name=None, index=None: {migrated: {}})
+    client.indices.update_aliases = AsyncMock()
+    monkeypatch.setattr(es_module, "es_client", client)
+
+    assert await es_module.rollover_write_alias() == migrated
+    client.indices.update_aliases.assert_not_called()
+
+    # A process starting before the swap still had the old concrete index as write target
+    client.indices.get_alias = AsyncMock(side_effect=lambda name=None, index=None: (
+        {migrated: {}} if index else {f"{settings.NEWS_INDEX}-2000.01": {}}
+    ))
+    await es_module.rollover_write_alias()
+    add = client.indices.update_aliases.call_args.kwargs["actions"][0]["add"]
+    assert add["index"] == migrated
+
+def test_synonyms_are_applied_at_search_time_only():
+    body = es_module.news_index_body()
+    analysis = body["settings"]["analysis"]
+
+    assert "india_business_synonym_filter" not in analysis["analyzer"]["business_india_analyzer"]["filter"]
+    assert "india_business_synonym_filter" in analysis["analyzer"]["business_india_search_analyzer"]["filter"]
+    assert analysis["filter"]["india_business_synonym_filter"]["updateable"] is True
+    for field in ("title", "content", "summary"):
+        assert body["mappings"]["properties"][field]["search_analyzer"] == "business_india_search_analyzer"
+
+def test_text_fields_are_copied_into_search_text():
+    properties = es_module.news_index_body()["mappings"]["properties"]
+
+    for field in ("title", "content", "summary"):
+        assert properties[field]["copy_to"] == "search_text"
+    assert "copy_to" not in properties["url"]
+    assert properties["search_text"]["search_analyzer"] == "business_india_search_analyzer"
@@ -0,0 +1,28 @@
+from app.core.keyword_matcher import KeywordMatcher, keyword_matcher
+
+def test_match_keywords_and_industries():
+    matcher = KeywordMatcher(
+        ["GST", "make in India", "dairy", "dairy exports"],
+        ["Food & Agro Processing"]
+    )
+
+    matches = matcher.match("Dairy  exports rise after GST cut in food & agro processing")
+
+    assert matches.keywords == ["dairy", "dairy exports", "GST"]
+    assert matches.industries == ["Food & Agro Processing"]
+
+def test_match_respects_word_boundaries():
+    matcher = KeywordMatcher(["SEZ", "tiles"], [])
+
+    assert matcher.match("seize the textiles market").keywords == []
+    assert matcher.match("new SEZ for tiles").keywords == ["SEZ", "tiles"]
+
+def test_match_empty_query():
+    matches = keyword_matcher.match("   ")
+    assert matches.keywords == []
+    assert matches.industries == []
+
+def test_canonical_lookup_is_case_insensitive():
+    assert keyword_matcher.canonical_keyword("msme") == "MSME"
+    assert keyword_matcher.canonical_industry("textiles & garments") == "Textiles & Garments"
+    assert keyword_matcher.canonical_keyword("not a keyword") is None
@@ -0,0 +1,481 @@
+import pytest
+from unittest.mock import patch, AsyncMock, MagicMock
+from app.core.config import settings
+from app.db.news_repository import NewsRepository
+
+@pytest.fixture(autouse=True)
+def single_index(monkeypatch):
+    # Partitioned writes are covered separately in the test_*_partition tests
+    monkeypatch.setattr(settings, "NEWS_INDEX_PARTITIONING", "none")
+
+def make_hit(article_id, sort=None):
+    return {
+        "_id": article_id,
+        "_source": {
+            "title": f"Title {article_id}",
+            "content": "Content",
+            "tags": [],
+            "created_at": "2023-01-01T00:00:00",
+            "updated_at": "2023-01-01T00:00:00"
+        },
+        "sort": sort or [1.0, 1672531200000, 1672531200000, 7]
+    }
+
+def test_cursor_round_trip():
+    cursor = NewsRepository._encode_cursor("pit-123", [1.5, 1672531200000, 42])
+    assert NewsRepository._decode_cursor(cursor) == ("pit-123", [1.5, 1672531200000, 42])
+
+def test_decode_invalid_cursor():
+    with pytest.raises(ValueError):
+        NewsRepository._decode_cursor("not-a-cursor")
+
+@pytest.mark.asyncio
+async def test_search_with_cursor_uses_pit_and_search_after():
+    es = MagicMock()
+    es.open_point_in_time = AsyncMock(return_value={"id": "pit-1"})
+    es.search = AsyncMock(return_value={
+        "pit_id": "pit-2",
+        "hits": {"total": {"value": 50}, "hits": [make_hit("a"), make_hit("b", [0.5, 1, 2, 9])]}
+    })
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es):
+        first = await NewsRepository.search("gst", [], limit=2, cursor="*")
+
+    body = es.search.call_args.kwargs["body"]
+    assert "index" not in es.search.call_args.kwargs
+    assert body["pit"]["id"] == "pit-1"
+    assert "from" not in body and "search_after" not in body
+    assert NewsRepository._decode_cursor(first["next_cursor"]) == ("pit-2", [0.5, 1, 2, 9])
+
+    es.search.return_value = {"pit_id": "pit-2", "hits": {"total": {"value": 50}, "hits": [make_hit("c")]}}
+    es.close_point_in_time = AsyncMock()
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es):
+        second = await NewsRepository.search("gst", [], limit=2, cursor=first["next_cursor"])
+
+    body = es.search.call_args.kwargs["body"]
+    assert body["search_after"] == [0.5, 1, 2, 9]
+    assert second["next_cursor"] is None
+    es.close_point_in_time.assert_awaited_once_with(id="pit-2")
+
+@pytest.mark.asyncio
+async def test_expired_cursor_is_a_value_error_and_failed_start_closes_pit():
+    from elasticsearch import NotFoundError
+
+    es = MagicMock()
+    es.open_point_in_time = AsyncMock(return_value={"id": "pit-1"})
+    es.close_point_in_time = AsyncMock()
+    es.search = AsyncMock(side_effect=NotFoundError("search_context_missing_exception", MagicMock(status=404), {}))
+    cursor = NewsRepository._encode_cursor("pit-old", [1.0])
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es):
+        with pytest.raises(ValueError, match="expired"):
+            await NewsRepository.search("gst", [], limit=2, cursor=cursor)
+        es.close_point_in_time.assert_not_called()
+
+        es.search.side_effect = RuntimeError("shard failure")
+        with pytest.raises(RuntimeError):
+            await NewsRepository.search("gst", [], limit=2, cursor="*")
+
+    es.close_point_in_time.assert_awaited_once_with(id="pit-1")
+
+@pytest.mark.asyncio
+async def test_only_pit_errors_on_continuation_pages_mean_expired_cursor():
+    from app.db.elasticsearch import BadRequestError
+
+    es = MagicMock()
+    es.search = AsyncMock(side_effect=BadRequestError(
+        "search_phase_execution_exception", MagicMock(status=400),
+        {"error": {"root_cause": [{"reason": "No mapping found for [bogus] in order to sort on"}]}}
+    ))
+    cursor = NewsRepository._encode_cursor("pit-old", [1.0])
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es):
+        with pytest.raises(ValueError, match=r"No mapping found for \[bogus\]"):
+            await NewsRepository.search("gst", [], limit=2, cursor=cursor)
+
+        es.search.side_effect = BadRequestError(
+            "illegal_argument_exception", MagicMock(status=400),
+            {"error": {"reason": "invalid id for point in time"}}
+        )
+        with pytest.raises(ValueError, match="expired"):
+            await NewsRepository.search("gst", [], limit=2, cursor=cursor)
+
+@pytest.mark.asyncio
+async def test_search_compact_view_uses_source_includes_and_snippet():
+    es = MagicMock()
+    es.search = AsyncMock(return_value={
+        "hits": {"total": {"value": 1}, "hits": [{
+            "_id": "a",
+            "_source": {"title": "GST cut", "summary": "Short", "source": "Example"},
+            "highlight": {"content": ["The <em>GST</em> council"]},
+            "sort": [1.0]
+        }]}
+    })
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es):
+        result = await NewsRepository.search("gst", [], limit=10, view="compact")
+
+    body = es.search.call_args.kwargs["body"]
+    assert body["_source"] == {"includes": ["title", "summary", "source", "published_date"]}
+    assert "content" in body["highlight"]["fields"]
+    article = result["articles"][0]
+    assert article["snippet"] == "The <em>GST</em> council"
+    assert "content" not in article
+
+@pytest.mark.asyncio
+async def test_iter_articles_pages_through_point_in_time():
+    es = MagicMock()
+    es.open_point_in_time = AsyncMock(return_value={"id": "pit-1"})
+    es.close_point_in_time = AsyncMock()
+    es.search = AsyncMock(side_effect=[
+        {"pit_id": "pit-1", "hits": {"hits": [make_hit("a", [1]), make_hit("b", [2])]}},
+        {"pit_id": "pit-2", "hits": {"hits": [make_hit("c", [3])]}}
+    ])
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es):
+        ids = [article["id"] async for article in NewsRepository.iter_articles(
+            industry="Food & Agro Processing",
+            batch_size=2
+        )]
+
+    assert ids == ["a", "b", "c"]
+    second_body = es.search.call_args_list[1].kwargs["body"]
+    assert second_body["search_after"] == [2]
+    assert second_body["sort"] == ["_shard_doc"]
+    industry_filter = second_body["query"]["bool"]["filter"][0]["bool"]["should"]
+    assert {"term": {"categories": "Food & Agro Processing"}} in industry_filter
+    assert {"FSSAI", "fssai"} <= set(industry_filter[1]["terms"]["tags"])
+    es.close_point_in_time.assert_awaited_once_with(id="pit-2")
+
+@pytest.mark.asyncio
+async def test_multi_search_keeps_order_and_reports_errors():
+    es = MagicMock()
+    es.msearch = AsyncMock(return_value={"responses": [
+        {"hits": {"total": {"value": 1}, "hits": [make_hit("a")]}},
+        {"error": {"type": "query_shard_exception", "reason": "Failed to parse query"}, "status": 400}
+    ]})
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es):
+        results = await NewsRepository.multi_search([
+            {"query": "gst", "page": 2, "limit": 5},
+            {"query": "bad(", "limit": 5}
+        ])
+
+    searches = es.msearch.call_args.kwargs["searches"]
+    assert len(searches) == 4
+    assert searches[1]["from"] == 5
+    assert searches[3]["query"]["bool"]["must"][0]["simple_query_string"]["query"] == "bad("
+    assert results[0]["page"] == 2
+    assert results[0]["articles"][0].id == "a"
+    assert results[1] == {"error": "Failed to parse query", "status": 400}
+
+@pytest.mark.asyncio
+async def test_search_facets_use_same_request_and_request_cache():
+    es = MagicMock()
+    es.search = AsyncMock(return_value={
+        "hits": {"total": {"value": 12}, "hits": []},
+        "aggregations": {"sources": {"buckets": [{"key": "example.com", "doc_count": 12}]}}
+    })
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es):
+        result = await NewsRepository.search("gst", [], limit=0, facets=["sources"])
+
+    assert es.search.await_count == 1
+    assert es.search.call_args.kwargs["request_cache"] is True
+    body = es.search.call_args.kwargs["body"]
+    assert body["aggs"] == {"sources": {"terms": {"field": "source", "size": 20}}}
+    assert result["facets"] == {"sources": [{"name": "example.com", "count": 12}]}
+
+@pytest.mark.asyncio
+async def test_suggest_titles_returns_ids_and_titles():
+    es = MagicMock()
+    es.search = AsyncMock(return_value={"suggest": {"title_suggest": [{"options": [
+        {"_id": "a", "text": "Dairy exports rise", "_source": {"title": "Dairy exports rise"}}
+    ]}]}})
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es):
+        suggestions = await NewsRepository.suggest_titles("dai", 3)
+
+    body = es.search.call_args.kwargs["body"]
+    assert body["suggest"]["title_suggest"]["completion"]["field"] == "title.suggest"
+    assert body["suggest"]["title_suggest"]["completion"]["size"] == 3
+    assert suggestions == [{"id": "a", "title": "Dairy exports rise"}]
+
+def test_build_search_query_scores_only_free_text():
+    body = NewsRepository._build_search_query("gst council", ["GST"], industry="Leather & Footwear")
+
+    bool_query = body["query"]["bool"]
+    assert bool_query["must"] == [{"simple_query_string": {
+        "query": "gst council",
+        "fields": ["title^3", "search_text"],
+        "flags": "AND|OR|NOT|PHRASE|PREFIX|PRECEDENCE|WHITESPACE|ESCAPE",
+        "default_operator": "or"
+    }}]
+    assert bool_query["filter"][0] == {"terms": {"tags": ["GST", "gst"]}}
+    assert bool_query["filter"][1]["bool"]["should"][0] == {"term": {"categories": "Leather & Footwear"}}
+
+def test_build_search_query_text_mode_uses_multi_match(monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_QUERY_MODE", "text")
+    body = NewsRepository._build_search_query("gst council", [])
+
+    assert body["query"]["bool"]["must"] == [{"multi_match": {
+        "query": "gst council",
+        "fields": ["title^3", "search_text"],
+        "type": "most_fields"
+    }}]
+
+def test_build_search_query_without_text_is_filter_only():
+    body = NewsRepository._build_search_query("  ", ["dairy"])
+
+    assert "must" not in body["query"]["bool"]
+    assert body["query"]["bool"]["filter"] == [{"terms": {"tags": ["dairy"]}}]
+    # Date-only browse matches the index sort and stops counting early
+    assert body["sort"] == [{"published_date": {"order": "desc"}}, {"created_at": {"order": "desc"}}]
+    assert body["track_total_hits"] == settings.SEARCH_TRACK_TOTAL_HITS
+
+def test_build_search_query_with_text_sorts_by_score_and_counts_exactly():
+    body = NewsRepository._build_search_query("gst", [])
+
+    assert body["sort"][0] == {"_score": {"order": "desc"}}
+    assert "track_total_hits" not in body
+
+def test_article_id_is_deterministic_per_normalized_url():
+    first = NewsRepository._article_id(NewsRepository._normalize_url("https://Example.com/a/?utm=1"))
+    second = NewsRepository._article_id(NewsRepository._normalize_url("https://example.com/a#top"))
+    other = NewsRepository._article_id(NewsRepository._normalize_url("https://example.com/b"))
+
+    assert first == second
+    assert first != other
+
+@pytest.mark.asyncio
+async def test_create_is_a_single_scripted_upsert():
+    from app.models.news import NewsArticleCreate
+
+    es = MagicMock()
+    es.search = AsyncMock()
+    es.update = AsyncMock(return_value={"result": "updated", "get": {"_source": {
+        "title": "A", "content": "a", "url": "https://example.com/a", "tags": ["MSME", "gst"],
+        "created_at": "2023-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00"
+    }}})
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es):
+        article = await NewsRepository.create(
+            NewsArticleCreate(title="A", content="a", url="https://example.com/a?utm=1", tags=["MSME"])
+        )
+
+    es.search.assert_not_called()
+    kwargs = es.update.call_args.kwargs
+    assert kwargs["id"] == NewsRepository._article_id("https://example.com/a")
+    assert kwargs["scripted_upsert"] is True
+    assert kwargs["script"]["params"]["doc"]["normalized_url"] == "https://example.com/a"
+    assert article.id == kwargs["id"]
+    assert set(article.tags) == {"MSME", "gst"}
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_reports_per_item():
+    from app.models.news import NewsArticleCreate
+
+    es = MagicMock()
+    es.search = AsyncMock()
+    articles = [
+        NewsArticleCreate(title="A", content="a", url="https://example.com/a?utm=1"),
+        NewsArticleCreate(title="No URL", content="b"),
+        NewsArticleCreate(title="A again", content="a", url="https://example.com/a#top")
+    ]
+
+    captured = []
+
+    async def fake_streaming_bulk(client, actions, **kwargs):
+        captured.extend(actions)
+        # The URL-less article hit a 429 and comes back last, after its retry
+        yield True, {"update": {"_id": captured[0]["_id"], "result": "created"}}
+        yield False, {"update": {"_id": captured[2]["_id"], "error": {"type": "version_conflict_engine_exception", "reason": "conflict"}}}
+        yield True, {"index": {"_id": captured[1]["_id"], "result": "created"}}
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es), \
+         patch("app.db.news_repository.async_streaming_bulk", fake_streaming_bulk):
+        results = await NewsRepository.bulk_upsert(articles, chunk_size=100)
+
+    es.search.assert_not_called()
+    assert [action["_op_type"] for action in captured] == ["update", "index", "update"]
+    assert captured[0]["_id"] == captured[2]["_id"]
+    assert captured[1]["_id"]
+    assert results == [
+        {"id": captured[0]["_id"], "result": "created"},
+        {"id": captured[1]["_id"], "result": "created"},
+        {"id": captured[0]["_id"], "result": "error", "error": "conflict"}
+    ]
+
+@pytest.mark.asyncio
+async def test_write_policies_map_to_refresh():
+    es = MagicMock()
+    es.delete = AsyncMock()
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es):
+        await NewsRepository.delete("a", write_policy="wait_for")
+        assert es.delete.call_args.kwargs["refresh"] == "wait_for"
+        await NewsRepository.delete("a", write_policy="immediate")
+        assert es.delete.call_args.kwargs["refresh"] is True
+        with pytest.raises(ValueError):
+            await NewsRepository.delete("a", write_policy="sometime")
+
+@pytest.mark.asyncio
+async def test_async_writes_are_buffered_and_flushed_in_bulk():
+    from app.db.write_buffer import WriteBehindBuffer
+    from app.models.news import NewsArticleCreate
+
+    es = MagicMock()
+    es.update = AsyncMock()
+    es.index = AsyncMock()
+    buffer = WriteBehindBuffer(max_actions=2, flush_interval=60)
+    flushed = []
+
+    async def fake_streaming_bulk(client, actions, **kwargs):
+        for action in actions:
+            flushed.append(action)
+            yield True, {action["_op_type"]: {"_id": action["_id"]}}
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es), \
+         patch("app.db.news_repository.write_buffer", buffer), \
+         patch("app.db.write_buffer.async_streaming_bulk", fake_streaming_bulk):
+        first = await NewsRepository.create(
+            NewsArticleCreate(title="A", content="a", url="https://example.com/a"), write_policy="async"
+        )
+        assert flushed == [] and buffer.stats()["pending"] == 1
+        second = await NewsRepository.create(NewsArticleCreate(title="B", content="b"), write_policy="async")
+        await buffer.close()
+
+    es.update.assert_not_called()
+    es.index.assert_not_called()
+    assert first.id == NewsRepository._article_id("https://example.com/a")
+    assert [action["_id"] for action in flushed] == [first.id, second.id]
+    stats = buffer.stats()
+    assert (stats["pending"], stats["flushes"], stats["flushed"], stats["failed"]) == (0, 1, 2, 0)
+
+@pytest.mark.asyncio
+async def test_update_is_one_round_trip_with_optimistic_concurrency():
+    from app.models.news import NewsArticleUpdate
+
+    es = MagicMock()
+    es.get = AsyncMock()
+    es.update = AsyncMock(return_value={"result": "updated", "get": {
+        "_seq_no": 8, "_primary_term": 1,
+        "_source": {"title": "A", "content": "a", "tags": ["gst", "msme"],
+                    "created_at": "2023-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00"}
+    }})
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es):
+        article = await NewsRepository.update(
+            "a", NewsArticleUpdate(tags=["gst", "msme"]), if_seq_no=7, if_primary_term=1
+        )
+
+    es.get.assert_not_called()
+    kwargs = es.update.call_args.kwargs
+    assert kwargs["if_seq_no"] == 7 and kwargs["if_primary_term"] == 1
+    assert kwargs["source"] is True
+    assert kwargs["script"]["params"]["doc"] == {"tags": ["gst", "msme"]}
+    assert article.id == "a" and article.tags == ["gst", "msme"]
+
+@pytest.mark.asyncio
+async def test_conditional_update_bypasses_write_buffer():
+    from app.models.news import NewsArticleUpdate
+
+    es = MagicMock()
+    es.update = AsyncMock(return_value={"result": "updated", "get": {
+        "_source": {"title": "A", "content": "a", "created_at": "2023-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00"}
+    }})
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es), \
+            patch("app.db.news_repository.write_buffer") as buffer:
+        buffer.add = AsyncMock()
+        await NewsRepository.update(
+            "a", NewsArticleUpdate(title="A"), write_policy="async", if_seq_no=7, if_primary_term=1
+        )
+
+    buffer.add.assert_not_called()
+    kwargs = es.update.call_args.kwargs
+    assert (kwargs["if_seq_no"], kwargs["if_primary_term"], kwargs["refresh"]) == (7, 1, False)
+
+@pytest.mark.asyncio
+async def test_get_many_keeps_order_and_marks_missing():
+    es = MagicMock()
+    es.mget = AsyncMock(return_value={"docs": [
+        {"_id": "b", "found": True, "_source": make_hit("b")["_source"]},
+        {"_id": "x", "found": False},
+        {"_id": "a", "found": True, "_source": make_hit("a")["_source"]}
+    ]})
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es):
+        articles = await NewsRepository.get_many(["b", "x", "a", "b"])
+
+    assert es.mget.call_args.kwargs["ids"] == ["b", "x", "a"]
+    assert [article.id if article else None for article in articles] == ["b", None, "a", "b"]
+
+@pytest.mark.asyncio
+async def test_create_writes_new_articles_through_write_alias(monkeypatch):
+    from app.models.news import NewsArticleCreate
+
+    monkeypatch.setattr(settings, "NEWS_INDEX_PARTITIONING", "monthly")
+    es = MagicMock()
+    es.search = AsyncMock(return_value={"hits": {"hits": []}})
+    es.update = AsyncMock(return_value={"result": "created", "get": {"_source": {
+        "title": "A", "content": "a", "created_at": "2024-03-02T00:00:00", "updated_at": "2024-03-02T00:00:00"
+    }}})
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es), \
+         patch("app.db.news_repository.write_index", AsyncMock(return_value=settings.NEWS_WRITE_ALIAS)):
+        article = await NewsRepository.create(NewsArticleCreate(
+            title="A", content="a", url="https://example.com/a", published_date="1970-01-01T00:00:00"
+        ))
+
+    # The id depends on the URL only, whatever the publication date
+    assert article.id == NewsRepository._article_id("https://example.com/a")
+    assert es.search.call_args.kwargs["index"] == settings.NEWS_READ_ALIAS
+    assert es.update.call_args.kwargs["index"] == settings.NEWS_WRITE_ALIAS
+
+@pytest.mark.asyncio
+async def test_existing_articles_stay_in_their_partition(monkeypatch):
+    from app.models.news import NewsArticleCreate, NewsArticleUpdate
+
+    monkeypatch.setattr(settings, "NEWS_INDEX_PARTITIONING", "monthly")
+    article_id = NewsRepository._article_id("https://example.com/a")
+    old_partition = f"{settings.NEWS_INDEX}-2024.01"
+    es = MagicMock()
+    es.search = AsyncMock(return_value={"hits": {"hits": [{"_id": article_id, "_index": old_partition}]}})
+    es.update = AsyncMock(return_value={"result": "updated", "get": {"_source": {
+        "title": "A", "content": "a", "created_at": "2024-01-02T00:00:00", "updated_at": "2024-05-02T00:00:00"
+    }}})
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es), \
+         patch("app.db.news_repository.write_index", AsyncMock(return_value=settings.NEWS_WRITE_ALIAS)):
+        await NewsRepository.create(NewsArticleCreate(title="A", content="a", url="https://example.com/a"))
+        assert es.update.call_args.kwargs["index"] == old_partition
+
+        await NewsRepository.update(article_id, NewsArticleUpdate(published_date="2024-05-01T00:00:00"))
+        assert es.update.call_args.kwargs["index"] == old_partition
+
+        actions = [
+            NewsRepository._upsert_action({"title": "A", "normalized_url": "https://example.com/a"}, "now"),
+            NewsRepository._upsert_action({"title": "B", "normalized_url": "https://example.com/b"}, "now")
+        ]
+        await NewsRepository._route_actions(actions)
+
+    assert [action["_index"] for action in actions] == [old_partition, settings.NEWS_WRITE_ALIAS]
+
+@pytest.mark.asyncio
+async def test_reload_search_analyzers_targets_read_index():
+    from app.core.cache import search_cache
+
+    es = MagicMock()
+    es.indices.reload_search_analyzers = AsyncMock(return_value={"reload_details": [
+        {"index": "news", "reloaded_analyzers": ["business_india_search_analyzer"], "reloaded_node_ids": ["n1"]}
+    ]})
+    generation = search_cache.generation
+
+    with patch("app.db.news_repository.get_elasticsearch", return_value=es):
+        details = await NewsRepository.reload_search_analyzers()
+
+    es.indices.reload_search_analyzers.assert_awaited_once_with(index=settings.NEWS_INDEX)
+    assert details[0]["reloaded_analyzers"] == ["business_india_search_analyzer"]
+    assert search_cache.generation == generation + 1
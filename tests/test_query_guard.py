@@ -0,0 +1,28 @@
+import pytest
+from app.core.query_guard import QueryGuard, QueryRejectedError
+
+def test_rewrites_leading_wildcards_and_short_prefixes():
+    guard = QueryGuard(max_clauses=10, max_term_length=20, min_prefix_length=3)
+
+    assert guard.check('*tax "gst council" -?duty') == 'tax "gst council" -duty'
+    assert guard.check("ex* export*") == "ex export*"
+    assert guard.check("gst council") == "gst council"
+    assert guard.stats()["rewritten"] == 2
+    assert guard.stats()["rejected"] == 0
+
+def test_rejects_too_many_terms_and_long_terms():
+    guard = QueryGuard(max_clauses=3, max_term_length=10)
+
+    with pytest.raises(QueryRejectedError) as error:
+        guard.check("a | b | c | d")
+    assert error.value.reason == "too_many_clauses"
+    with pytest.raises(QueryRejectedError) as error:
+        guard.check("x" * 11)
+    assert error.value.reason == "term_too_long"
+
+    stats = guard.stats()
+    assert stats["rejected"] == 2
+    assert stats["rejected_by_reason"] == {"too_many_clauses": 1, "term_too_long": 1}
+
+def test_operators_and_quotes_are_not_terms():
+    assert QueryGuard.terms('+(gst | "input tax") -refund*') == ["gst", "input", "tax", "refund"]
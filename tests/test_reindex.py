@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.db.news_repository import NewsRepository
+from scripts import reindex
+from scripts.reindex import delete_missing, next_version, rekey_legacy, swap_actions
+
+def test_next_version_counts_the_original_as_v1():
+    assert next_version("news-2024.03", "news-2024.03") == "news-2024.03-v2"
+    assert next_version("news-2024.03", "news-2024.03-v2") == "news-2024.03-v3"
+
+def test_swap_moves_aliases_and_takes_over_the_name():
+    actions = swap_actions(
+        "news-2024.03",
+        "news-2024.03-v2",
+        "news-2024.03-v3",
+        {"news-read": {}, "news-write": {"is_write_index": True}, "news-2024.03": {}}
+    )
+
+    assert actions == [
+        {"add": {"index": "news-2024.03-v3", "alias": "news-read"}},
+        {"add": {"index": "news-2024.03-v3", "alias": "news-write", "is_write_index": True}},
+        {"add": {"index": "news-2024.03-v3", "alias": "news-2024.03"}},
+        {"remove_index": {"index": "news-2024.03-v2"}}
+    ]
+
+@pytest.mark.asyncio
+async def test_delete_missing_removes_documents_deleted_from_the_source():
+    async def scan(*args, **kwargs):
+        for article_id in ("a", "b", "c"):
+            yield {"_id": article_id}
+
+    deleted = []
+
+    async def bulk(es, actions):
+        deleted.extend(action["_id"] for action in actions)
+
+    es = MagicMock()
+    es.mget = AsyncMock(side_effect=lambda index, ids, source: {
+        "docs": [{"_id": article_id, "found": article_id != "b"} for article_id in ids]
+    })
+
+    with patch.object(reindex, "async_scan", scan), patch.object(reindex, "async_bulk", bulk):
+        count = await delete_missing(es, "news-2024.03", "news-2024.03-v2", SimpleNamespace(batch_size=2))
+
+    assert count == 1
+    assert deleted == ["b"]
+    assert es.mget.await_count == 2
+
+@pytest.mark.asyncio
+async def test_rekey_moves_legacy_ids_and_drops_duplicates():
+    url = "example.com/story"
+    taken_url = "example.com/taken"
+
+    async def scan(*args, **kwargs):
+        yield {"_id": NewsRepository._article_id("example.com/current"), "_source": {"normalized_url": "example.com/current"}}
+        yield {"_id": "legacy-1", "_source": {"normalized_url": url}}
+        yield {"_id": "legacy-2", "_source": {"normalized_url": taken_url}}
+
+    sent = []
+
+    async def bulk(es, actions, **kwargs):
+        sent.extend(actions)
+        return 3, [{"create": {"_id": NewsRepository._article_id(taken_url), "status": 409}}]
+
+    with patch.object(reindex, "async_scan", scan), patch.object(reindex, "async_bulk", bulk):
+        moved, dropped = await rekey_legacy(MagicMock(), "news-v2", SimpleNamespace(batch_size=100))
+
+    assert (moved, dropped) == (1, 1)
+    assert [(action["_op_type"], action["_id"]) for action in sent] == [
+        ("create", NewsRepository._article_id(url)),
+        ("delete", "legacy-1"),
+        ("create", NewsRepository._article_id(taken_url)),
+        ("delete", "legacy-2"),
+    ]
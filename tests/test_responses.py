@@ -0,0 +1,32 @@
+from app.models.responses.news import NewsArticleResponse, NewsArticleCompactResponse
+
+DOCUMENT = {
+    "id": "a",
+    "title": "Dairy exports rise",
+    "content": "Body",
+    "published_date": "2024-03-01T10:15:00",
+    "tags": None,
+    "url": "https://example.com/a",
+    "normalized_url": "https://example.com/a",
+    "created_at": "2024-03-01T10:20:00",
+    "updated_at": "2024-03-01T10:20:00",
+    "snippet": "<em>Dairy</em> exports"
+}
+
+def test_payload_from_document_matches_response_model_fields():
+    payload = NewsArticleResponse.payload_from_document(DOCUMENT, [])
+
+    assert list(payload) == list(NewsArticleResponse.model_fields)
+    assert payload["tags"] == []
+    assert payload["categories"] == []
+    assert payload["published_date"] == "2024-03-01T10:15:00"
+    assert "normalized_url" not in payload
+    # The trusted payload must still be a valid response
+    NewsArticleResponse.model_validate(payload)
+
+def test_compact_payload_from_document():
+    payload = NewsArticleCompactResponse.payload_from_document(DOCUMENT, ["dairy"])
+
+    assert list(payload) == list(NewsArticleCompactResponse.model_fields)
+    assert payload["snippet"] == "<em>Dairy</em> exports"
+    assert payload["image_url"] is not None
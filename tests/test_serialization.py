@@ -0,0 +1,25 @@
+import json
+from datetime import datetime
+from app.core.serialization import FastJSONResponse, dumps_json
+from app.models.responses.news import NewsArticleResponse
+
+def test_dumps_json_handles_datetimes_and_models():
+    article = NewsArticleResponse(
+        id="a",
+        title="Title",
+        content="Body",
+        url="https://example.com/a",
+        created_at=datetime(2024, 3, 1, 10, 20),
+        updated_at=datetime(2024, 3, 1, 10, 20)
+    )
+
+    decoded = json.loads(dumps_json({"article": article, "at": datetime(2024, 3, 1)}))
+
+    assert decoded["at"] == "2024-03-01T00:00:00"
+    assert decoded["article"]["url"] == "https://example.com/a"
+    assert decoded["article"]["created_at"] == "2024-03-01T10:20:00"
+
+def test_fast_json_response_passes_bytes_through():
+    response = FastJSONResponse(content=b'{"cached":true}')
+    assert response.body == b'{"cached":true}'
+    assert response.media_type == "application/json"
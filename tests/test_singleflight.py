@@ -0,0 +1,44 @@
+import asyncio
+import pytest
+from app.core.singleflight import SingleFlight
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    executions = 0
+
+    async def slow_search():
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.01)
+        return {"hits": executions}
+
+    results = await asyncio.gather(*[flight.do("same", slow_search) for _ in range(5)])
+
+    assert executions == 1
+    assert results == [{"hits": 1}] * 5
+    stats = flight.stats()
+    assert stats["calls"] == 5
+    assert stats["coalesced"] == 4
+    assert stats["in_flight"] == 0
+
+    # Once finished, the next call executes again
+    await flight.do("same", slow_search)
+    assert executions == 2
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_with_waiters():
+    flight = SingleFlight()
+
+    async def failing_search():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("cluster unavailable")
+
+    results = await asyncio.gather(
+        flight.do("key", failing_search),
+        flight.do("key", failing_search),
+        return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.stats()["executions"] == 1
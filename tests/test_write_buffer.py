@@ -0,0 +1,51 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from app.db.write_buffer import WriteBehindBuffer, WriteBufferFullError
+
+@pytest.mark.asyncio
+async def test_close_resends_writes_of_a_cancelled_flush():
+    buffer = WriteBehindBuffer(max_actions=100, flush_interval=0.01)
+    started = asyncio.Event()
+    sent = []
+
+    async def hanging_bulk(client, actions, **kwargs):
+        started.set()
+        await asyncio.sleep(3600)
+        yield True, {}
+
+    async def working_bulk(client, actions, **kwargs):
+        for action in actions:
+            sent.append(action["_id"])
+            yield True, {"index": {"_id": action["_id"]}}
+
+    with patch("app.db.write_buffer.get_elasticsearch"):
+        with patch("app.db.write_buffer.async_streaming_bulk", hanging_bulk):
+            await buffer.add({"_op_type": "index", "_index": "news", "_id": "a", "_source": {}})
+            # The periodic flush has taken the action and is stuck sending it
+            await asyncio.wait_for(started.wait(), 1)
+        with patch("app.db.write_buffer.async_streaming_bulk", working_bulk):
+            await buffer.close()
+
+    assert sent == ["a"]
+    assert buffer.stats()["pending"] == 0
+
+@pytest.mark.asyncio
+async def test_full_buffer_refuses_writes_while_cluster_is_down():
+    buffer = WriteBehindBuffer(max_actions=2, flush_interval=60, max_pending=3)
+
+    async def failing_bulk(client, actions, **kwargs):
+        raise ConnectionError("cluster down")
+        yield
+
+    with patch("app.db.write_buffer.get_elasticsearch"), \
+         patch("app.db.write_buffer.async_streaming_bulk", failing_bulk):
+        for article_id in ("a", "b", "c"):
+            # Failed flushes keep the writes queued instead of failing the caller
+            await buffer.add({"_op_type": "delete", "_index": "news", "_id": article_id})
+        with pytest.raises(WriteBufferFullError):
+            await buffer.add({"_op_type": "delete", "_index": "news", "_id": "d"})
+
+        stats = buffer.stats()
+        assert (stats["pending"], stats["rejected"]) == (3, 1)
+        buffer._task.cancel()